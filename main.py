@@ -11,7 +11,12 @@ import os
 import sys
 
 # Make the src/ layout importable when running directly from a checkout.
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+# Only src/ is added (never the repo root), so the package is always
+# imported as ``motion_detector`` and never a second time as
+# ``src.motion_detector``.
+_SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from motion_detector.cli import main
 
@@ -122,6 +122,8 @@ setup(
             "pillow>=9.0.0",
             "scikit-image>=0.19.0",
             "matplotlib>=3.5.0",
+            "orjson>=3.9.0",
+            "PyTurboJPEG>=1.7.0",
         ],
         "all": [
             "pytest>=7.0.0",
@@ -135,6 +137,8 @@ setup(
             "pillow>=9.0.0",
             "scikit-image>=0.19.0",
             "matplotlib>=3.5.0",
+            "orjson>=3.9.0",
+            "PyTurboJPEG>=1.7.0",
         ],
     },
     entry_points={
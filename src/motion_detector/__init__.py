@@ -3,15 +3,32 @@ Motion Detector Package
 Core components for motion detection system.
 """
 
+import importlib
+from typing import Any
+
 __version__ = "1.0.0"
 __author__ = "Dylan Patriarchi"
 __email__ = "dylanpatri04@gmail.com"
 __description__ = "Professional motion detection system for Raspberry Pi"
 
-from .core.detector import MotionDetector
-from .core.camera import CameraManager
-from .core.processor import ImageProcessor
-from .utils.logger import setup_logger
-from .config.settings import Settings
+# Public names and the submodule defining each. They are imported on first
+# access (PEP 562) so lightweight entry points such as ``--help`` and
+# ``--version`` do not pay for loading OpenCV and numpy.
+_EXPORTS = {
+    "MotionDetector": ".core.detector",
+    "CameraManager": ".core.camera",
+    "ImageProcessor": ".core.processor",
+    "setup_logger": ".utils.logger",
+    "Settings": ".config.settings",
+}
 
 __all__ = ["MotionDetector", "CameraManager", "ImageProcessor", "setup_logger", "Settings"]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,24 +1,32 @@
 """
 Command Line Interface
 Entry point and argument parsing for the motion detection system.
+
+Heavy dependencies (OpenCV, numpy, psutil) are imported inside the
+functions that need them so ``--help`` and ``--version`` start instantly.
 """
 
 import argparse
 import sys
 
+from typing import List
+
 from . import __version__
-from .core.detector import MotionDetector
-from .utils.validators import run_system_diagnostics
-from .utils.logger import setup_logger
 
 
-def create_argument_parser() -> argparse.ArgumentParser:
-    """Create command line argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="motion-detector",
-        description="Professional Motion Detection System for Raspberry Pi",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+def _emit(lines: List[str]) -> None:
+    """Write a block of output lines with a single write call.
+
+    Under systemd/journald stdout is a pipe, so every ``print`` is its own
+    write syscall; batching a logical block keeps start-up output cheap.
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+# Only formatted by argparse when help is printed; kept at module level so
+# building the parser does not re-create it.
+_EPILOG = """
 Examples:
   %(prog)s                          # Run with default settings
   %(prog)s --config custom.json     # Use custom configuration
@@ -30,7 +38,16 @@ Interactive Controls (when preview is enabled):
   q - Quit application
   r - Reset background frame
   s - Save manual photo
-        """,
+        """
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """Create command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="motion-detector",
+        description="Professional Motion Detection System for Raspberry Pi",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     parser.add_argument(
@@ -65,50 +82,56 @@ def run_diagnostics() -> bool:
     Returns:
         bool: True if the system is ready, False otherwise.
     """
-    print("🔍 Running System Diagnostics...")
-    print("=" * 50)
+    from .utils.logger import setup_logger
+    from .utils.validators import run_system_diagnostics
+
+    # Flush the header before diagnostics start logging to stdout.
+    _emit(["🔍 Running System Diagnostics...", "=" * 50])
 
     logger = setup_logger("Diagnostics", level="INFO")
     results = run_system_diagnostics(logger)
 
-    print("\n📊 System Information:")
-    sys_info = results.get("system_info", {})
-    print(f"  Platform: {sys_info.get('platform', 'Unknown')}")
-    print(f"  Architecture: {sys_info.get('machine', 'Unknown')}")
-    print(f"  Python Version: {sys_info.get('python_version', 'Unknown')}")
-    print(f"  CPU Cores: {sys_info.get('cpu_count', 'Unknown')}")
-    print(f"  Memory: {sys_info.get('memory_gb', 0):.1f} GB")
-
-    print("\n🔧 Component Status:")
-    print(f"  OpenCV: {'✅ Available' if results.get('opencv_available') else '❌ Not Available'}")
-    if results.get("opencv_version"):
-        print(f"    Version: {results['opencv_version']}")
-
-    print(
-        f"  Camera: {'✅ Accessible' if results.get('camera_accessible') else '❌ Not Accessible'}"
+    lines = [
+        "\n📊 System Information:",
+        f"  Platform: {results.platform}",
+        f"  Architecture: {results.machine}",
+        f"  Python Version: {results.python_version}",
+        f"  CPU Cores: {results.cpu_count}",
+        f"  Memory: {results.memory_gb:.1f} GB",
+        "\n🔧 Component Status:",
+        f"  OpenCV: {'✅ Available' if results.opencv_available else '❌ Not Available'}",
+    ]
+    if results.opencv_version:
+        lines.append(f"    Version: {results.opencv_version}")
+
+    lines.append(
+        f"  Camera: {'✅ Accessible' if results.camera_accessible else '❌ Not Accessible'}"
     )
-    if results.get("camera_message"):
-        print(f"    {results['camera_message']}")
-
-    print(f"  Disk Space: {'✅ OK' if results.get('disk_space_ok') else '⚠️  Low'}")
-    if results.get("disk_free_gb"):
-        print(f"    Available: {results['disk_free_gb']:.1f} GB")
-
-    print(f"  Memory: {'✅ OK' if results.get('memory_ok') else '⚠️  Low'}")
-    if results.get("memory_available_mb"):
-        print(f"    Available: {results['memory_available_mb']:.0f} MB")
-
-    print(f"\n🎯 System Ready: {'✅ YES' if results.get('system_ready') else '❌ NO'}")
-
-    if not results.get("system_ready"):
-        print("\n💡 Recommendations:")
-        print("  - Install missing dependencies: pip install -r requirements.txt")
-        print("  - Check camera connection and permissions")
-        print("  - Ensure sufficient disk space and memory")
-        print("  - On Raspberry Pi, enable camera: sudo raspi-config")
-
+    if results.camera_message:
+        lines.append(f"    {results.camera_message}")
+
+    lines.append(f"  Disk Space: {'✅ OK' if results.disk_space_ok else '⚠️  Low'}")
+    if results.disk_free_gb:
+        lines.append(f"    Available: {results.disk_free_gb:.1f} GB")
+
+    lines.append(f"  Memory: {'✅ OK' if results.memory_ok else '⚠️  Low'}")
+    if results.memory_available_mb:
+        lines.append(f"    Available: {results.memory_available_mb:.0f} MB")
+
+    lines.append(f"\n🎯 System Ready: {'✅ YES' if results.system_ready else '❌ NO'}")
+
+    if not results.system_ready:
+        lines += [
+            "\n💡 Recommendations:",
+            "  - Install missing dependencies: pip install -r requirements.txt",
+            "  - Check camera connection and permissions",
+            "  - Ensure sufficient disk space and memory",
+            "  - On Raspberry Pi, enable camera: sudo raspi-config",
+        ]
+        _emit(lines)
         return False
 
+    _emit(lines)
     return True
 
 
@@ -118,52 +141,66 @@ def main() -> None:
     args = parser.parse_args()
 
     # Show banner
-    print("🎥 Raspberry Pi Motion Detection System")
-    print(f"   Professional Edition v{__version__}")
-    print("=" * 50)
+    _emit(
+        [
+            "🎥 Raspberry Pi Motion Detection System",
+            f"   Professional Edition v{__version__}",
+            "=" * 50,
+        ]
+    )
 
     # Run diagnostics if requested
     if args.diagnostics:
         success = run_diagnostics()
         sys.exit(0 if success else 1)
 
+    from .core.detector import MotionDetector
+
     try:
         # Create motion detector instance
         detector = MotionDetector(config_file=args.config)
 
         # Apply command line overrides
+        lines = []
         if args.debug:
             detector.settings.logging.level = "DEBUG"
             detector.settings.system.debug_mode = True
-            print("🐛 Debug mode enabled")
+            lines.append("🐛 Debug mode enabled")
 
         if args.no_preview:
             detector.settings.display.show_preview = False
-            print("📺 Preview disabled")
+            lines.append("📺 Preview disabled")
+
+        # Snapshot the settings once the overrides above are applied.
+        hot = detector.settings.freeze()
 
         # Display configuration summary
         camera_cfg = detector.settings.camera
-        print("\n⚙️  Configuration Summary:")
-        print(f"  Camera: {camera_cfg.resolution} @ {camera_cfg.framerate}fps")
-        print(f"  Motion Threshold: {detector.settings.detection.motion_threshold}")
-        print(f"  Output Directory: {detector.settings.storage.output_directory}")
-        print(f"  Photo Delay: {detector.settings.storage.photo_delay}s")
-        print(f"  Preview: {'Enabled' if detector.settings.display.show_preview else 'Disabled'}")
-        print(f"  Debug Mode: {'Enabled' if detector.settings.system.debug_mode else 'Disabled'}")
-
-        # Quick system check
-        print("\n🔍 Quick System Check...")
-        if detector.settings.system.debug_mode:
+        debug_mode = detector.settings.system.debug_mode
+        lines += [
+            "\n⚙️  Configuration Summary:",
+            f"  Camera: {camera_cfg.resolution} @ {camera_cfg.framerate}fps",
+            f"  Motion Threshold: {detector.settings.detection.motion_threshold}",
+            f"  Output Directory: {detector.settings.storage.output_directory}",
+            f"  Photo Delay: {hot.photo_delay}s",
+            f"  Preview: {'Enabled' if hot.show_preview else 'Disabled'}",
+            f"  Debug Mode: {'Enabled' if debug_mode else 'Disabled'}",
+            # Quick system check
+            "\n🔍 Quick System Check...",
+        ]
+        _emit(lines)
+        if debug_mode:
             run_diagnostics()
 
-        print("\n🚀 Starting Motion Detection System...")
-        print("   Press Ctrl+C to stop")
-
-        if detector.settings.display.show_preview:
-            print("   Interactive controls:")
-            print("     q - Quit")
-            print("     r - Reset background")
-            print("     s - Save photo")
+        lines = ["\n🚀 Starting Motion Detection System...", "   Press Ctrl+C to stop"]
+        if hot.show_preview:
+            lines += [
+                "   Interactive controls:",
+                "     q - Quit",
+                "     r - Reset background",
+                "     s - Save photo",
+            ]
+        _emit(lines)
 
         # Start the system
         with detector:
@@ -3,7 +3,7 @@ Configuration Management
 Configuration classes and settings for motion detection system.
 """
 
-from .settings import Settings
+from .settings import HotParams, Settings
 from .defaults import DEFAULT_CONFIG
 
-__all__ = ["Settings", "DEFAULT_CONFIG"]
+__all__ = ["Settings", "HotParams", "DEFAULT_CONFIG"]
@@ -3,21 +3,31 @@ Default Configuration
 Default settings for the motion detection system.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Tuple
+import operator
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, List, Tuple
 
 # Capture backends recognized by config validation and backend selection.
 VALID_CAMERA_BACKENDS = ("auto", "opencv", "picamera2")
 
+# Pixel formats the OpenCV backend can request from a V4L2 camera.
+VALID_PIXEL_FORMATS = ("auto", "YUYV", "MJPG")
+
 # Notification delivery backends recognized by config validation.
 VALID_NOTIFIERS = ("none", "webhook", "telegram")
 
 # Motion detection algorithms recognized by config validation.
 VALID_DETECTION_ALGORITHMS = ("frame_diff", "mog2", "knn")
 
+# Noise filters the processor can apply before differencing.
+VALID_BLUR_METHODS = ("gaussian", "stack", "box")
+
 # Video container formats recognized by the recorder.
 VALID_VIDEO_FORMATS = ("avi", "mp4")
 
+# Logging levels accepted in config; matched case-insensitively.
+VALID_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
 
 @dataclass
 class CameraConfig:
@@ -30,6 +40,10 @@ class CameraConfig:
     # Capture backend: "auto" (picamera2 if available, else OpenCV),
     # "opencv" (USB/V4L2), or "picamera2" (Raspberry Pi Camera Module).
     backend: str = "auto"
+    # Pixel format requested by the OpenCV backend: "YUYV" (uncompressed, no
+    # JPEG decode per frame), "MJPG" (compressed, higher fps over USB 2), or
+    # "auto" (YUYV when the camera delivers the requested fps, else MJPG).
+    pixel_format: str = "auto"
 
 
 @dataclass
@@ -48,6 +62,26 @@ class DetectionConfig:
     # When non-empty, motion is only detected inside these regions; empty
     # means the whole frame is monitored.
     regions: List[List[int]] = field(default_factory=list)
+    # Run the pixel pipeline through OpenCV's transparent API (cv2.UMat) so
+    # an OpenCL device, e.g. the Pi 4/5 VideoCore GPU, does the work.
+    # Ignored when OpenCV reports no OpenCL support.
+    use_opencl: bool = False
+    # Update the background model every N frames. The learning rate is
+    # scaled to match, so larger values trade adaptation granularity for
+    # less memory traffic per frame.
+    background_update_interval: int = 1
+    # Run detection on frames downscaled by this factor (0 < scale <= 1).
+    # The capture thread resizes once; areas, thresholds and regions stay in
+    # full-resolution pixels and saved photos keep the full frame.
+    detect_scale: float = 1.0
+    # Noise filter: "gaussian" (cv2.GaussianBlur), "stack" (cv2.stackBlur,
+    # cost independent of kernel size) or "box" (three box-filter passes
+    # approximating the same Gaussian with integer arithmetic).
+    blur_method: str = "gaussian"
+    # For the "mog2"/"knn" algorithms: classify shadows (and discard them).
+    # Disabling it skips the shadow test and the mask threshold pass, but
+    # moving shadows then count as motion.
+    detect_shadows: bool = True
 
 
 @dataclass
@@ -60,6 +94,7 @@ class StorageConfig:
     photo_quality: int = 95
     max_photos: int = 1000  # Maximum photos to keep
     cleanup_enabled: bool = True
+    cleanup_interval: float = 300.0  # Seconds between cleanup sweeps
     # Record a short video clip on motion, in addition to the snapshot.
     record_video: bool = False
     video_duration: float = 5.0
@@ -76,6 +111,9 @@ class DisplayConfig:
     draw_contours: bool = True
     show_fps: bool = True
     preview_scale: float = 1.0
+    # Refresh rate of the preview window. Rendering runs on its own thread,
+    # so this only bounds how often frames are handed to it.
+    preview_fps: int = 15
 
 
 @dataclass
@@ -116,6 +154,9 @@ class SystemConfig:
     active_hours_enabled: bool = False
     active_start: str = "00:00"
     active_end: str = "23:59"
+    # OpenCV worker threads; 0 keeps the default (on ARM, one core is left
+    # free for the capture thread).
+    opencv_threads: int = 0
 
 
 def create_default_config() -> dict:
@@ -143,3 +184,21 @@ def create_default_config() -> dict:
 # Backwards-compatible module-level defaults. Treat as read-only: use
 # create_default_config() whenever a mutable copy is required.
 DEFAULT_CONFIG = create_default_config()
+
+# Field names and a single attrgetter per config section, computed once so
+# serializing or updating a section never re-walks dataclass metadata.
+_CONFIG_CLASSES = (
+    CameraConfig,
+    DetectionConfig,
+    StorageConfig,
+    DisplayConfig,
+    LoggingConfig,
+    NotificationConfig,
+    SystemConfig,
+)
+FIELD_NAMES: Dict[type, Tuple[str, ...]] = {
+    cls: tuple(f.name for f in fields(cls)) for cls in _CONFIG_CLASSES
+}
+FIELD_GETTERS: Dict[type, Callable] = {
+    cls: operator.attrgetter(*FIELD_NAMES[cls]) for cls in _CONFIG_CLASSES
+}
@@ -3,26 +3,105 @@ Settings Management
 Professional configuration management with validation and file I/O.
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 import logging
 
+try:  # Optional C JSON codec; the stdlib json module is used without it.
+    import orjson
+except ImportError:  # pragma: no cover - depends on optional package
+    orjson = None  # type: ignore[assignment]
+
 from .defaults import (
+    FIELD_GETTERS,
+    FIELD_NAMES,
+    CameraConfig,
+    DetectionConfig,
+    DisplayConfig,
+    LoggingConfig,
+    NotificationConfig,
+    StorageConfig,
+    SystemConfig,
     create_default_config,
+    VALID_BLUR_METHODS,
     VALID_CAMERA_BACKENDS,
     VALID_DETECTION_ALGORITHMS,
+    VALID_LOG_LEVELS,
     VALID_NOTIFIERS,
+    VALID_PIXEL_FORMATS,
     VALID_VIDEO_FORMATS,
 )
 from ..utils.schedule import parse_hhmm
 
+# Parsed config files keyed by (path, mtime_ns, size). Several Settings
+# objects are typically built per process (CLI, diagnostics, tests), so an
+# unchanged file is only read and parsed once.
+_CONFIG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from raw bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to indented JSON bytes, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+class HotParams(NamedTuple):
+    """Immutable snapshot of the settings read on every frame.
+
+    Built by :meth:`Settings.freeze` so the detection loop can bind plain
+    locals once instead of walking ``settings.<section>.<field>`` chains per
+    frame. Rebuild it after changing the underlying dataclasses.
+    """
+
+    background_update_interval: int
+    detect_scale: float
+    photo_delay: float
+    cleanup_enabled: bool
+    max_photos: int
+    show_preview: bool
+    draw_contours: bool
+    show_fps: bool
+    preview_scale: float
+    preview_fps: int
+    performance_monitoring: bool
+
 
 class Settings:
     """
     Professional settings management class with validation and persistence.
     """
 
+    # Config sections, in serialization order. Each is an attribute holding
+    # the matching dataclass from create_default_config().
+    _SECTIONS = (
+        "camera",
+        "detection",
+        "storage",
+        "display",
+        "logging",
+        "system",
+        "notifications",
+    )
+
+    camera: CameraConfig
+    detection: DetectionConfig
+    storage: StorageConfig
+    display: DisplayConfig
+    logging: LoggingConfig
+    system: SystemConfig
+    notifications: NotificationConfig
+
     def __init__(self, config_file: Optional[str] = None):
         """
         Initialize settings manager.
@@ -44,23 +123,41 @@ class Settings:
     def _load_defaults(self) -> None:
         """Assign a fresh set of default config objects to this instance."""
         defaults = create_default_config()
-        self.camera = defaults["camera"]
-        self.detection = defaults["detection"]
-        self.storage = defaults["storage"]
-        self.display = defaults["display"]
-        self.logging = defaults["logging"]
-        self.system = defaults["system"]
-        self.notifications = defaults["notifications"]
+        for name in self._SECTIONS:
+            setattr(self, name, defaults[name])
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached config file contents."""
+        _CONFIG_CACHE.clear()
+
+    def _read_config_file(self, stat_result: os.stat_result) -> Dict[str, Any]:
+        """Return the parsed config file, reusing the cache while it is unchanged."""
+        key = (self.config_file, stat_result.st_mtime_ns, stat_result.st_size)
+        config_data = _CONFIG_CACHE.get(key)
+        if config_data is None:
+            config_data = _json_loads(Path(self.config_file).read_bytes())
+            _CONFIG_CACHE[key] = config_data
+
+        # Hand out a copy so mutable values (lists) are never shared between
+        # Settings instances or with the cache itself.
+        return copy.deepcopy(config_data)
+
+    def _invalidate_cache(self) -> None:
+        """Forget cached contents of this instance's config file."""
+        for key in [key for key in _CONFIG_CACHE if key[0] == self.config_file]:
+            del _CONFIG_CACHE[key]
 
     def load_config(self) -> None:
         """Load configuration from file."""
-        if not os.path.exists(self.config_file):
+        try:
+            stat_result = os.stat(self.config_file)
+        except FileNotFoundError:
             self.logger.info(f"Config file {self.config_file} not found, using defaults")
             return
 
         try:
-            with open(self.config_file, "r") as f:
-                config_data = json.load(f)
+            config_data = self._read_config_file(stat_result)
 
             # Update configurations with loaded data
             self._update_from_dict(config_data)
@@ -84,8 +181,8 @@ class Settings:
 
             config_data = self._to_dict()
 
-            with open(self.config_file, "w") as f:
-                json.dump(config_data, f, indent=2)
+            self._invalidate_cache()
+            Path(self.config_file).write_bytes(_json_dumps(config_data))
 
             self.logger.info(f"Configuration saved to {self.config_file}")
 
@@ -94,51 +191,25 @@ class Settings:
 
     def _update_from_dict(self, config_data: Dict[str, Any]) -> None:
         """Update configuration from dictionary."""
-        if "camera" in config_data:
-            self._update_dataclass(self.camera, config_data["camera"])
-
-        if "detection" in config_data:
-            self._update_dataclass(self.detection, config_data["detection"])
-
-        if "storage" in config_data:
-            self._update_dataclass(self.storage, config_data["storage"])
-
-        if "display" in config_data:
-            self._update_dataclass(self.display, config_data["display"])
-
-        if "logging" in config_data:
-            self._update_dataclass(self.logging, config_data["logging"])
-
-        if "system" in config_data:
-            self._update_dataclass(self.system, config_data["system"])
-
-        if "notifications" in config_data:
-            self._update_dataclass(self.notifications, config_data["notifications"])
+        for name in self._SECTIONS:
+            section = config_data.get(name)
+            if section:
+                self._update_dataclass(getattr(self, name), section)
 
     def _update_dataclass(self, dataclass_instance: Any, data: Dict[str, Any]) -> None:
         """Update dataclass instance with dictionary data."""
-        for key, value in data.items():
-            if hasattr(dataclass_instance, key):
-                setattr(dataclass_instance, key, value)
+        # Unknown keys are ignored; only declared fields are assigned.
+        for key in data.keys() & FIELD_NAMES[type(dataclass_instance)]:
+            setattr(dataclass_instance, key, data[key])
 
     def _to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
-        return {
-            "camera": self._dataclass_to_dict(self.camera),
-            "detection": self._dataclass_to_dict(self.detection),
-            "storage": self._dataclass_to_dict(self.storage),
-            "display": self._dataclass_to_dict(self.display),
-            "logging": self._dataclass_to_dict(self.logging),
-            "system": self._dataclass_to_dict(self.system),
-            "notifications": self._dataclass_to_dict(self.notifications),
-        }
+        return {name: self._dataclass_to_dict(getattr(self, name)) for name in self._SECTIONS}
 
     def _dataclass_to_dict(self, dataclass_instance: Any) -> Dict[str, Any]:
         """Convert dataclass instance to dictionary."""
-        return {
-            field: getattr(dataclass_instance, field)
-            for field in dataclass_instance.__dataclass_fields__
-        }
+        cls = type(dataclass_instance)
+        return dict(zip(FIELD_NAMES[cls], FIELD_GETTERS[cls](dataclass_instance)))
 
     def validate(self) -> bool:
         """
@@ -158,18 +229,30 @@ class Settings:
             if self.camera.backend not in VALID_CAMERA_BACKENDS:
                 raise ValueError(f"Camera backend must be one of {list(VALID_CAMERA_BACKENDS)}")
 
+            if self.camera.pixel_format not in VALID_PIXEL_FORMATS:
+                raise ValueError(f"Camera pixel format must be one of {list(VALID_PIXEL_FORMATS)}")
+
             # Validate detection settings
             if self.detection.algorithm not in VALID_DETECTION_ALGORITHMS:
                 raise ValueError(
                     f"Detection algorithm must be one of {list(VALID_DETECTION_ALGORITHMS)}"
                 )
 
+            if self.detection.blur_method not in VALID_BLUR_METHODS:
+                raise ValueError(f"Blur method must be one of {list(VALID_BLUR_METHODS)}")
+
             if self.detection.motion_threshold <= 0:
                 raise ValueError("Motion threshold must be positive")
 
             if self.detection.min_area <= 0:
                 raise ValueError("Minimum area must be positive")
 
+            if self.detection.background_update_interval < 1:
+                raise ValueError("Background update interval must be at least 1")
+
+            if not 0 < self.detection.detect_scale <= 1:
+                raise ValueError("Detection scale must be in (0, 1]")
+
             for region in self.detection.regions:
                 if len(region) != 4:
                     raise ValueError("Each detection region must be [x, y, width, height]")
@@ -180,6 +263,9 @@ class Settings:
             if self.storage.photo_delay < 0:
                 raise ValueError("Photo delay cannot be negative")
 
+            if self.storage.cleanup_interval <= 0:
+                raise ValueError("Cleanup interval must be positive")
+
             if self.storage.photo_quality < 1 or self.storage.photo_quality > 100:
                 raise ValueError("Photo quality must be between 1 and 100")
 
@@ -192,16 +278,24 @@ class Settings:
                 if self.storage.video_fps <= 0:
                     raise ValueError("Video fps must be positive")
 
+            # Validate display settings
+            if self.display.preview_fps <= 0:
+                raise ValueError("Preview fps must be positive")
+
             # Validate logging settings
-            valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-            if self.logging.level not in valid_log_levels:
-                raise ValueError(f"Log level must be one of {valid_log_levels}")
+            # setup_logger upper-cases the level, so "info" is as valid as "INFO".
+            self.logging.level = str(self.logging.level).upper()
+            if self.logging.level not in VALID_LOG_LEVELS:
+                raise ValueError(f"Log level must be one of {list(VALID_LOG_LEVELS)}")
 
             # Validate active-hours settings (parse_hhmm raises on bad format)
             if self.system.active_hours_enabled:
                 parse_hhmm(self.system.active_start)
                 parse_hhmm(self.system.active_end)
 
+            if self.system.opencv_threads < 0:
+                raise ValueError("OpenCV threads must be 0 (automatic) or positive")
+
             # Validate notification settings
             if self.notifications.backend not in VALID_NOTIFIERS:
                 raise ValueError(f"Notification backend must be one of {list(VALID_NOTIFIERS)}")
@@ -226,6 +320,27 @@ class Settings:
             self.logger.error(f"Configuration validation failed: {e}")
             return False
 
+    def freeze(self) -> HotParams:
+        """
+        Snapshot the per-frame settings into an immutable tuple.
+
+        Returns:
+            HotParams: Current values of the hot-path settings
+        """
+        return HotParams(
+            background_update_interval=self.detection.background_update_interval,
+            detect_scale=self.detection.detect_scale,
+            photo_delay=self.storage.photo_delay,
+            cleanup_enabled=self.storage.cleanup_enabled,
+            max_photos=self.storage.max_photos,
+            show_preview=self.display.show_preview,
+            draw_contours=self.display.draw_contours,
+            show_fps=self.display.show_fps,
+            preview_scale=self.display.preview_scale,
+            preview_fps=self.display.preview_fps,
+            performance_monitoring=self.system.performance_monitoring,
+        )
+
     def reset_to_defaults(self) -> None:
         """Reset configuration to default values."""
         self._load_defaults()
@@ -4,9 +4,11 @@ Professional camera handling with error recovery and performance monitoring.
 """
 
 import cv2
+import os
 import time
 import threading
-from typing import Optional
+from collections import deque
+from typing import List, Optional, Tuple
 import logging
 import numpy as np
 
@@ -19,6 +21,10 @@ class CameraManager:
     Professional camera management with error recovery and performance monitoring.
     """
 
+    # Preallocated frame slots the capture thread retrieves into. One slot is
+    # published, one may still be held by the consumer and one is written.
+    FRAME_RING_SIZE = 3
+
     def __init__(self, config, logger: Optional[logging.Logger] = None):
         """
         Initialize camera manager.
@@ -33,17 +39,43 @@ class CameraManager:
         self.motion_logger = MotionDetectionLogger(self.logger)
 
         self.backend: Optional[CaptureBackend] = None
+        # Backend description (resolution, fps, driver) captured once at
+        # initialize; querying it again costs an ioctl per property.
+        self._info: dict = {}
         self.is_initialized = False
         self.is_streaming = False
         self.frame_count = 0
         self.fps_counter = 0
-        self.last_fps_time = time.time()
+        # Monotonic nanoseconds: immune to NTP steps and cheap integer math.
+        self.last_fps_time = time.monotonic_ns()
+        # Recent per-frame capture durations (ns). Appending to a bounded
+        # deque is atomic and cheap; statistics are computed only on demand.
+        self._capture_times_ns: deque = deque(maxlen=256)
 
         # Threading for frame capture
         self.capture_thread: Optional[threading.Thread] = None
         self.latest_frame: Optional[np.ndarray] = None
+        self._frame_ring: List[np.ndarray] = []
+        self._ring_index = 0
+
+        # Downscaled copies for motion detection, one per ring slot. Resizing
+        # once here lets detection work on far fewer pixels per frame.
+        self.detect_scale = 1.0
+        self.latest_small: Optional[np.ndarray] = None
+        self._small_ring: List[np.ndarray] = []
         self.frame_lock = threading.Lock()
+        # Signalled whenever a new frame is published; consumers block on it
+        # instead of polling with sleeps.
+        self._new_frame = threading.Condition(self.frame_lock)
+        self._frame_seq = 0
+        # Last sequence handed to the (single) get_frame consumer.
+        self._delivered_seq = 0
+        self._frame_wait_timeout = max(0.1, 2.0 / max(1, int(config.framerate)))
         self.stop_event = threading.Event()
+        # Set by get_frame() when the consumer is ready for a new frame. The
+        # capture thread grabs every frame (keeping the driver queue fresh)
+        # but only decodes/converts one when this is set.
+        self._frame_wanted = threading.Event()
 
         # Error recovery
         self.consecutive_errors = 0
@@ -52,6 +84,16 @@ class CameraManager:
         self.error_recovery_delay = 5.0  # seconds
         self.error_retry_delay = 0.1  # short backoff between failed reads
 
+        # Stale-frame draining. Several drivers ignore CAP_PROP_BUFFERSIZE=1
+        # and queue a few frames; a grab that returns much faster than the
+        # frame interval came from that queue rather than the sensor.
+        self.max_stale_grabs = 3
+        self._stale_grab_threshold_ns = 250_000_000 // max(1, int(config.framerate))
+
+        # Optional CPU the capture thread pins itself to (Linux only), so it
+        # does not compete with OpenCV's worker threads for a core.
+        self.capture_cpu: Optional[int] = None
+
     def initialize(self) -> bool:
         """
         Initialize camera with configuration settings.
@@ -82,7 +124,7 @@ class CameraManager:
             self.consecutive_errors = 0
 
             # Log camera info
-            info = self.backend.describe()
+            info = self._info = self.backend.describe()
             width, height = info.get("resolution", (0, 0))
             fps = info.get("fps", 0.0)
             self.motion_logger.log_camera_event(
@@ -114,6 +156,7 @@ class CameraManager:
 
         try:
             self.stop_event.clear()
+            self._frame_wanted.set()
             self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
             self.capture_thread.start()
 
@@ -138,8 +181,20 @@ class CameraManager:
         self.is_streaming = False
         self.motion_logger.log_camera_event("Streaming stopped")
 
+    def _pin_capture_thread(self) -> None:
+        """Pin the calling (capture) thread to ``capture_cpu`` if requested."""
+        if self.capture_cpu is None or not hasattr(os, "sched_setaffinity"):
+            return
+        try:
+            # pid 0 applies to the calling thread on Linux.
+            os.sched_setaffinity(0, {self.capture_cpu})
+            self.logger.info(f"Capture thread pinned to CPU {self.capture_cpu}")
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not pin capture thread to CPU {self.capture_cpu}: {e}")
+
     def _capture_loop(self) -> None:
         """Main capture loop running in separate thread."""
+        self._pin_capture_thread()
         while not self.stop_event.is_set():
             try:
                 if not self.backend or not self.backend.is_opened():
@@ -147,59 +202,182 @@ class CameraManager:
                     self.stop_event.wait(self.error_retry_delay)
                     continue
 
-                start_time = time.time()
-                ret, frame = self.backend.read()
-                capture_time = (time.time() - start_time) * 1000  # ms
-
-                if not ret or frame is None:
+                start_ns = time.monotonic_ns()
+                if not self.backend.grab():
                     self._handle_camera_error("Failed to capture frame")
                     self.stop_event.wait(self.error_retry_delay)
                     continue
+                grab_ns = time.monotonic_ns() - start_ns
+
+                # Only pay for decoding when the consumer wants a new frame.
+                if self._frame_wanted.is_set() or self.latest_frame is None:
+                    self._drain_stale_frames(grab_ns)
+                    if not self._retrieve_into_ring():
+                        self._handle_camera_error("Failed to retrieve frame")
+                        self.stop_event.wait(self.error_retry_delay)
+                        continue
 
-                # Update frame with thread safety
-                with self.frame_lock:
-                    self.latest_frame = frame.copy()
+                now_ns = time.monotonic_ns()
 
                 # Update performance metrics
                 self.frame_count += 1
                 self.fps_counter += 1
-                self.performance_logger.log_processing_time("capture", capture_time)
+                self._capture_times_ns.append(now_ns - start_ns)
 
                 # Calculate FPS every second
-                current_time = time.time()
-                if current_time - self.last_fps_time >= 1.0:
-                    fps = self.fps_counter / (current_time - self.last_fps_time)
-                    self.performance_logger.log_fps(fps)
+                elapsed_ns = now_ns - self.last_fps_time
+                if elapsed_ns >= 1_000_000_000:
+                    self.performance_logger.log_fps(self.fps_counter * 1e9 / elapsed_ns)
                     self.fps_counter = 0
-                    self.last_fps_time = current_time
+                    self.last_fps_time = now_ns
 
                 # Reset error counter on successful capture
                 self.consecutive_errors = 0
 
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.001)
-
             except Exception as e:
                 self._handle_camera_error(f"Capture loop error: {e}")
                 self.stop_event.wait(self.error_retry_delay)
 
-    def get_frame(self) -> Optional[np.ndarray]:
+    def _drain_stale_frames(self, last_grab_ns: int) -> int:
+        """Grab past frames that were already queued in the driver.
+
+        Args:
+            last_grab_ns: Duration of the grab that preceded this call, in ns
+
+        Returns:
+            int: Number of extra grabs performed
+        """
+        assert self.backend is not None
+        drained = 0
+        while last_grab_ns < self._stale_grab_threshold_ns and drained < self.max_stale_grabs:
+            start_ns = time.monotonic_ns()
+            if not self.backend.grab():
+                break
+            last_grab_ns = time.monotonic_ns() - start_ns
+            drained += 1
+        return drained
+
+    def _retrieve_into_ring(self) -> bool:
+        """Retrieve the grabbed frame into the next ring slot and publish it."""
+        assert self.backend is not None
+        write_index = (self._ring_index + 1) % self.FRAME_RING_SIZE
+        dst = self._frame_ring[write_index] if self._frame_ring else None
+
+        ret, frame = self.backend.retrieve(dst)
+        if not ret or frame is None:
+            return False
+
+        if frame is not dst:
+            # First frame, or the backend could not write in place (e.g. the
+            # resolution changed): size the ring from this frame.
+            self._frame_ring = [np.empty_like(frame) for _ in range(self.FRAME_RING_SIZE)]
+            self._frame_ring[write_index] = frame
+            self._small_ring = []
+        frame = self._frame_ring[write_index]
+
+        small = None
+        if self.detect_scale < 1.0:
+            if not self._small_ring:
+                width, height = self._detect_size(frame)
+                small_shape = (height, width) + frame.shape[2:]
+                self._small_ring = [
+                    np.empty(small_shape, frame.dtype) for _ in range(self.FRAME_RING_SIZE)
+                ]
+            small = self._downscale(frame, self._small_ring[write_index])
+
+        # Update frame with thread safety
+        with self._new_frame:
+            self._ring_index = write_index
+            self.latest_frame = frame
+            self.latest_small = small
+            self._frame_seq += 1
+            # Clear before waking the consumer: a re-arm that follows this
+            # publish must survive to prefetch the next frame.
+            self._frame_wanted.clear()
+            self._new_frame.notify_all()
+        return True
+
+    def _detect_size(self, frame: np.ndarray) -> Tuple[int, int]:
+        """Return the (width, height) of ``frame`` scaled by ``detect_scale``."""
+        height, width = frame.shape[:2]
+        return max(1, round(width * self.detect_scale)), max(1, round(height * self.detect_scale))
+
+    def _downscale(self, frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resize ``frame`` by ``detect_scale`` for motion detection."""
+        return cv2.resize(frame, self._detect_size(frame), dst=dst, interpolation=cv2.INTER_AREA)
+
+    def get_frame(self, copy: bool = True) -> Optional[np.ndarray]:
         """
         Get the latest captured frame.
 
+        Blocks until a frame newer than the last one handed out is
+        published, or for about two frame intervals.
+
+        Args:
+            copy: Return a private copy. With ``copy=False`` the frame is a
+                view of the capture ring: treat it as read-only and stop
+                using it before the next ``get_frame`` call.
+
         Returns:
             Optional[np.ndarray]: Latest frame or None if not available
         """
+        return self.get_frame_pair(copy)[0]
+
+    def get_frame_pair(
+        self, copy: bool = True
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Get the latest frame together with its downscaled detection copy.
+
+        Same waiting and ``copy`` semantics as :meth:`get_frame`. Delivery is
+        tracked for a single consumer: a second caller would take frames the
+        first is waiting for, so other readers use :meth:`peek_frame`.
+
+        Returns:
+            Tuple: (frame, small); small is None when ``detect_scale`` is 1.0
+        """
         if not self.is_streaming:
             # Direct capture if not streaming
-            return self._capture_single_frame()
+            frame = self._capture_single_frame()
+            if frame is None or self.detect_scale >= 1.0:
+                return frame, None
+            return frame, self._downscale(frame)
+
+        # Wait for a fresh frame from streaming
+        with self._new_frame:
+            if self._frame_seq == self._delivered_seq:
+                self._frame_wanted.set()
+                if not self._new_frame.wait_for(
+                    lambda: self._frame_seq != self._delivered_seq,
+                    timeout=self._frame_wait_timeout,
+                ):
+                    return None, None
+            self._delivered_seq = self._frame_seq
+            frame = self.latest_frame
+            small = self.latest_small
+            if copy:
+                frame = frame.copy() if frame is not None else None
+                small = small.copy() if small is not None else None
+
+        # Ask the capture thread to retrieve the next frame.
+        self._frame_wanted.set()
+        return frame, small
+
+    def peek_frame(self) -> Optional[np.ndarray]:
+        """
+        Copy the most recently published frame without consuming it.
 
-        # Return latest frame from streaming
-        with self.frame_lock:
-            if self.latest_frame is not None:
-                return self.latest_frame.copy()
+        For secondary readers such as the video recorder. Unlike
+        :meth:`get_frame` it never waits and does not ask the capture thread
+        for a new frame, so it cannot advance the ring under the frame the
+        primary consumer borrowed with ``copy=False``.
 
-        return None
+        Returns:
+            Optional[np.ndarray]: Copy of the latest frame or None if none yet
+        """
+        with self.frame_lock:
+            frame = self.latest_frame
+            return frame.copy() if frame is not None else None
 
     def _capture_single_frame(self) -> Optional[np.ndarray]:
         """Capture single frame directly from camera."""
@@ -264,7 +442,7 @@ class CameraManager:
             return {}
 
         try:
-            info = self.backend.describe()
+            info = self._info
             return {
                 "device_index": self.config.device_index,
                 "resolution": info.get("resolution"),
@@ -279,11 +457,29 @@ class CameraManager:
             self.logger.error(f"Failed to get camera info: {e}")
             return {}
 
+    def get_capture_statistics(self) -> dict:
+        """
+        Summarize recent capture durations.
+
+        Returns:
+            dict: ``samples``, ``mean_ms`` and ``p95_ms`` over the last 256
+            captured frames (empty when nothing was captured yet)
+        """
+        samples = sorted(tuple(self._capture_times_ns))
+        if not samples:
+            return {}
+        return {
+            "samples": len(samples),
+            "mean_ms": sum(samples) / len(samples) / 1e6,
+            "p95_ms": samples[int(0.95 * (len(samples) - 1))] / 1e6,
+        }
+
     def reset_statistics(self) -> None:
         """Reset performance statistics."""
         self.frame_count = 0
         self.fps_counter = 0
-        self.last_fps_time = time.time()
+        self.last_fps_time = time.monotonic_ns()
+        self._capture_times_ns.clear()
         self.performance_logger.reset_metrics()
 
     def cleanup(self) -> None:
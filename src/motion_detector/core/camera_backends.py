@@ -16,12 +16,17 @@ to how frames are produced. Two backends are provided:
 
 import importlib.util
 import logging
+import sys
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple
 
 import cv2
 import numpy as np
 
+FOURCC_MJPG = cv2.VideoWriter_fourcc(*"MJPG")
+FOURCC_YUYV = cv2.VideoWriter_fourcc(*"YUYV")
+_PIXEL_FORMATS = {"MJPG": FOURCC_MJPG, "YUYV": FOURCC_YUYV}
+
 
 def picamera2_available() -> bool:
     """Return True if the picamera2 library can be imported."""
@@ -36,6 +41,7 @@ class CaptureBackend(ABC):
     def __init__(self, config, logger: Optional[logging.Logger] = None):
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        self._grabbed: Optional[np.ndarray] = None
 
     @abstractmethod
     def open(self) -> None:
@@ -49,6 +55,30 @@ class CaptureBackend(ABC):
     def read(self) -> Tuple[bool, Optional[np.ndarray]]:
         """Return (success, frame) with the frame in BGR order."""
 
+    def grab(self) -> bool:
+        """Advance to the next frame without producing a BGR image.
+
+        Backends that can split acquisition from decoding override this and
+        :meth:`retrieve`; the default simply reads and holds the frame.
+        """
+        ret, frame = self.read()
+        self._grabbed = frame if ret else None
+        return self._grabbed is not None
+
+    def retrieve(self, dst: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Return the frame acquired by the last :meth:`grab` in BGR order.
+
+        Args:
+            dst: Optional preallocated buffer the frame may be written into.
+        """
+        frame = self._grabbed
+        if frame is None:
+            return False, None
+        if dst is not None and dst.shape == frame.shape:
+            np.copyto(dst, frame)
+            return True, dst
+        return True, frame
+
     @abstractmethod
     def describe(self) -> dict:
         """Return {'resolution': (w, h), 'fps': float, 'backend': str}."""
@@ -68,7 +98,16 @@ class OpenCVBackend(CaptureBackend):
         self._capture: Optional[cv2.VideoCapture] = None
 
     def open(self) -> None:
-        capture = cv2.VideoCapture(self.config.device_index)
+        capture = None
+        if sys.platform.startswith("linux"):
+            # Going straight to V4L2 skips OpenCV's backend probing and makes
+            # the pixel format request below reach the driver.
+            capture = cv2.VideoCapture(self.config.device_index, cv2.CAP_V4L2)
+            if not capture.isOpened():
+                capture.release()
+                capture = None
+        if capture is None:
+            capture = cv2.VideoCapture(self.config.device_index)
         if not capture.isOpened():
             capture.release()
             raise RuntimeError(f"Cannot open camera device {self.config.device_index}")
@@ -80,12 +119,35 @@ class OpenCVBackend(CaptureBackend):
         capture = self._capture
         if capture is None:
             return
+        pixel_format = getattr(self.config, "pixel_format", "auto")
+        if pixel_format == "auto":
+            # Uncompressed YUYV avoids a JPEG decode per frame, but USB 2
+            # bandwidth often caps its fps; fall back to MJPG when it does.
+            if not self._apply_format(FOURCC_YUYV):
+                self._apply_format(FOURCC_MJPG)
+        else:
+            self._apply_format(_PIXEL_FORMATS.get(pixel_format, FOURCC_MJPG))
+        # Keep only the freshest frame to minimize latency.
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def _apply_format(self, fourcc: int) -> bool:
+        """Request ``fourcc`` plus the configured size and fps.
+
+        Returns:
+            bool: True if the driver accepted the format and the configured
+            framerate.
+        """
+        capture = self._capture
+        assert capture is not None
+        # Set the format first: the sizes and rates on offer depend on it.
+        capture.set(cv2.CAP_PROP_FOURCC, fourcc)
         capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.resolution[0])
         capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.resolution[1])
         capture.set(cv2.CAP_PROP_FPS, self.config.framerate)
-        # Keep only the freshest frame to minimize latency.
-        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc("M", "J", "P", "G"))
+
+        accepted = int(capture.get(cv2.CAP_PROP_FOURCC)) == fourcc
+        fast_enough = capture.get(cv2.CAP_PROP_FPS) >= self.config.framerate
+        return accepted and fast_enough
 
     def is_opened(self) -> bool:
         return self._capture is not None and self._capture.isOpened()
@@ -95,6 +157,20 @@ class OpenCVBackend(CaptureBackend):
             return False, None
         return self._capture.read()
 
+    def grab(self) -> bool:
+        # VideoCapture.grab() dequeues the buffer without decoding it, so
+        # frames that are never retrieved cost no MJPEG decode.
+        if self._capture is None:
+            return False
+        return self._capture.grab()
+
+    def retrieve(self, dst: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._capture is None:
+            return False, None
+        if dst is not None:
+            return self._capture.retrieve(dst)
+        return self._capture.retrieve()
+
     def describe(self) -> dict:
         if self._capture is None:
             return {"resolution": tuple(self.config.resolution), "fps": 0.0, "backend": self.name}
@@ -162,6 +238,26 @@ class PiCamera2Backend(CaptureBackend):
             self.logger.debug(f"picamera2 capture failed: {exc}")
             return False, None
 
+    def grab(self) -> bool:
+        # Hold the raw RGB array; the colour conversion is deferred to
+        # retrieve() so frames the detector never asks for skip it.
+        if self._camera is None:
+            return False
+        try:
+            self._grabbed = self._camera.capture_array()
+            return True
+        except Exception as exc:  # pragma: no cover - hardware failure path
+            self.logger.debug(f"picamera2 capture failed: {exc}")
+            self._grabbed = None
+            return False
+
+    def retrieve(self, dst: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if self._grabbed is None:
+            return False, None
+        if dst is not None:
+            return True, cv2.cvtColor(self._grabbed, cv2.COLOR_RGB2BGR, dst=dst)
+        return True, cv2.cvtColor(self._grabbed, cv2.COLOR_RGB2BGR)
+
     def describe(self) -> dict:
         return {
             "resolution": tuple(self.config.resolution),
@@ -3,21 +3,25 @@ Main Motion Detector
 Professional motion detection system orchestrating all components.
 """
 
+import logging
+import os
+import queue
 import signal
-import sys
+import threading
 import time
-import platform
 import cv2
+import numpy as np
 from typing import Optional
 
 from .camera import CameraManager
 from .processor import ImageProcessor
-from ..config.settings import Settings
+from ..config.settings import HotParams, Settings
 from ..utils.logger import setup_logger, MotionDetectionLogger
 from ..utils.file_manager import FileManager
 from ..utils.notifier import NotificationManager
 from ..utils.schedule import is_active_now
 from ..utils.video_recorder import VideoRecorder
+from ..utils.platform_info import IS_ARM
 from ..utils.validators import run_system_diagnostics
 
 
@@ -26,6 +30,10 @@ class MotionDetector:
     Main motion detection system coordinating all components.
     """
 
+    # Pending motion photos for the writer thread. Kept small so a slow SD
+    # card drops photos instead of buffering frames without bound.
+    SAVE_QUEUE_SIZE = 4
+
     def __init__(self, config_file: Optional[str] = None):
         """
         Initialize motion detection system.
@@ -35,6 +43,9 @@ class MotionDetector:
         """
         # Load configuration
         self.settings = Settings(config_file)
+        # Per-frame settings snapshot; refreshed once initialization has
+        # applied any overrides and platform optimizations.
+        self._hot: HotParams = self.settings.freeze()
 
         # Setup logging
         self.logger = setup_logger(
@@ -58,11 +69,39 @@ class MotionDetector:
 
         # System state
         self.is_running = False
+        # Set to ask the main loop to exit; safe to set from a signal handler.
+        self.stop_event = threading.Event()
         self.is_initialized = False
-        self.last_photo_time = 0.0
+        # Monotonic seconds; -inf so the first motion event is never throttled.
+        self.last_photo_time = float("-inf")
+        self._use_opencl = False
+
+        # Motion photos are encoded and written off the detection loop.
+        self._save_queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=self.SAVE_QUEUE_SIZE)
+        self._writer_thread: Optional[threading.Thread] = None
+
+        # Old photos are pruned on a timer thread rather than the main loop.
+        self._cleanup_thread: Optional[threading.Thread] = None
+
+        # Preview buffers, allocated on the first displayed frame and reused.
+        self._display_scratch: Optional[np.ndarray] = None
+        self._display_resized: Optional[np.ndarray] = None
+
+        # Preview runs on its own thread. The main loop publishes a frame into
+        # a single slot at preview_fps; key presses come back as events that
+        # the main loop acts on, so only it touches the processor and camera.
+        self._preview_thread: Optional[threading.Thread] = None
+        self._preview_lock = threading.Lock()
+        self._preview_frame: Optional[np.ndarray] = None
+        self._preview_contours: list = []
+        self._preview_motion = False
+        self._preview_seq = 0
+        self._preview_quit_event = threading.Event()
+        self._reset_background_event = threading.Event()
+        self._manual_capture_event = threading.Event()
 
         # Performance monitoring
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.frame_count = 0
 
         # Setup signal handlers for graceful shutdown
@@ -74,9 +113,10 @@ class MotionDetector:
         """Setup signal handlers for graceful shutdown."""
 
         def signal_handler(signum, frame):
+            # Only flag the shutdown; the main loop notices within one frame
+            # wait and stop()/cleanup run from its finally block.
             self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            self.stop()
-            sys.exit(0)
+            self.stop_event.set()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
@@ -98,14 +138,20 @@ class MotionDetector:
 
             # Run system diagnostics
             if self.settings.system.debug_mode:
-                diagnostics = run_system_diagnostics(self.logger)
-                if not diagnostics.get("system_ready", False):
+                # The CLI may have just probed the camera; don't reopen it.
+                diagnostics = run_system_diagnostics(
+                    self.logger,
+                    cached_camera_probe=True,
+                    camera_backend=self.settings.camera.backend,
+                )
+                if not diagnostics.system_ready:
                     self.logger.warning("System diagnostics indicate potential issues")
 
             # Apply Raspberry Pi optimizations if detected
-            if platform.machine().startswith("arm"):
+            if IS_ARM:
                 self.logger.info("ARM processor detected, applying Raspberry Pi optimizations")
                 self._apply_raspberry_pi_optimizations()
+            self._configure_opencv()
 
             # Initialize file manager
             self.file_manager = FileManager(self.settings.storage.output_directory, self.logger)
@@ -127,13 +173,18 @@ class MotionDetector:
 
             # Initialize image processor
             self.image_processor = ImageProcessor(self.settings.detection, self.logger)
+            self._use_opencl = self._enable_opencl()
 
             # Apply processor optimizations if needed
-            if platform.machine().startswith("arm"):
+            if IS_ARM:
                 self.image_processor.optimize_for_raspberry_pi()
 
             # Initialize camera manager
             self.camera_manager = CameraManager(self.settings.camera, self.logger)
+            self.camera_manager.detect_scale = self.settings.detection.detect_scale
+            if IS_ARM and (os.cpu_count() or 1) > 1:
+                # The core OpenCV's thread pool was sized to leave free.
+                self.camera_manager.capture_cpu = 0
 
             if not self.camera_manager.initialize():
                 self.logger.error("Camera initialization failed")
@@ -144,6 +195,7 @@ class MotionDetector:
                 self.logger.warning("Low storage space detected")
 
             self.is_initialized = True
+            self._hot = self.settings.freeze()
             self.motion_logger.log_system_event("System initialization completed")
 
             # Log configuration summary
@@ -155,6 +207,17 @@ class MotionDetector:
             self.logger.error(f"System initialization failed: {e}")
             return False
 
+    def _enable_opencl(self) -> bool:
+        """Turn on OpenCV's OpenCL path if configured and available."""
+        if not self.settings.detection.use_opencl:
+            return False
+        if not cv2.ocl.haveOpenCL():
+            self.logger.warning("use_opencl is set but OpenCV has no OpenCL support; using CPU")
+            return False
+        cv2.ocl.setUseOpenCL(True)
+        self.logger.info("OpenCL enabled for motion detection")
+        return True
+
     def _apply_raspberry_pi_optimizations(self) -> None:
         """Apply Raspberry Pi specific optimizations."""
         # Reduce camera resolution for better performance
@@ -171,6 +234,19 @@ class MotionDetector:
         if not self.settings.display.show_preview:
             self.settings.display.show_preview = False
 
+    def _configure_opencv(self) -> None:
+        """Enable OpenCV's optimized code paths and size its thread pool."""
+        cv2.setUseOptimized(True)
+
+        threads = self.settings.system.opencv_threads
+        if threads <= 0 and IS_ARM:
+            # Leave one core to the capture thread instead of letting OpenCV
+            # start a worker per core and oversubscribe the CPU.
+            threads = (os.cpu_count() or 1) - 1
+        if threads > 0:
+            cv2.setNumThreads(threads)
+            self.logger.info(f"Limited OpenCV to {threads} threads")
+
     def start(self) -> None:
         """Start the motion detection system."""
         if not self.is_initialized:
@@ -183,13 +259,19 @@ class MotionDetector:
 
         try:
             self.motion_logger.log_system_event("Motion detection started")
+            self.stop_event.clear()
             self.is_running = True
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
 
             # Start camera streaming for better performance
             if self.camera_manager:
                 self.camera_manager.start_streaming()
 
+            self._start_writer()
+            if self._hot.cleanup_enabled:
+                self._start_cleanup()
+            if self._hot.show_preview:
+                self._start_preview()
             self._main_loop()
 
         except Exception as e:
@@ -204,43 +286,82 @@ class MotionDetector:
         # Components are guaranteed initialized before the loop runs.
         assert self.camera_manager and self.image_processor and self.file_manager
 
+        # Bind per-frame settings to locals once rather than per iteration.
+        hot = self._hot
+        show_preview = hot.show_preview
+        performance_monitoring = hot.performance_monitoring
+        use_opencl = self._use_opencl
+        preview_interval_ns = 1_000_000_000 // hot.preview_fps
+        # Updating every N frames with the rate compounded over N keeps the
+        # background's adaptation speed unchanged.
+        bg_interval = hot.background_update_interval
+        bg_learning_rate = 1 - (1 - ImageProcessor.DEFAULT_LEARNING_RATE) ** bg_interval
+        last_preview_ns = 0
+
         try:
-            while self.is_running:
-                # Get frame from camera
-                frame = self.camera_manager.get_frame()
+            while not self.stop_event.is_set():
+                # Get frame from camera. The loop only reads it (the preview
+                # draws on its own copy), so borrow the capture buffer. The
+                # call re-arms the capture thread before returning, so the
+                # next frame is retrieved while this one is being processed.
+                frame, small = self.camera_manager.get_frame_pair(copy=False)
                 if frame is None:
                     time.sleep(0.1)
                     continue
 
                 self.frame_count += 1
 
+                # Detect on the downscaled copy when there is one; photos and
+                # the preview keep the full frame.
+                if small is not None:
+                    detect_frame, detect_scale = small, hot.detect_scale
+                else:
+                    detect_frame, detect_scale = frame, 1.0
+
+                # Upload once so detection and the background update both run
+                # on the OpenCL device; drawing and saving keep the ndarray.
+                if use_opencl:
+                    detect_frame = cv2.UMat(detect_frame)
+
                 # Process frame for motion detection
-                motion_detected, contours, diff_image = self.image_processor.detect_motion(frame)
+                motion_detected, contours, diff_image = self.image_processor.detect_motion(
+                    detect_frame, detect_scale
+                )
 
                 # Handle motion detection (only within active hours)
                 if motion_detected and is_active_now(self.settings.system):
-                    self._handle_motion_detected(frame, contours)
+                    self._handle_motion_detected(
+                        frame, contours, self.image_processor.last_motion_area
+                    )
 
                 # Update background
-                self.image_processor.update_background(frame)
-
-                # Display preview if enabled
-                if self.settings.display.show_preview:
-                    self._display_preview(frame, contours, motion_detected)
-
-                # Cleanup old files periodically
-                if self.settings.storage.cleanup_enabled and self.frame_count % 1000 == 0:
-                    self.file_manager.cleanup_old_files(
-                        self.settings.storage.max_photos, max_age_days=30
-                    )
+                if self.frame_count % bg_interval == 0:
+                    self.image_processor.update_background(detect_frame, bg_learning_rate)
+
+                # Hand a frame to the preview thread at its own cadence
+                if show_preview:
+                    now_ns = time.monotonic_ns()
+                    if now_ns - last_preview_ns >= preview_interval_ns:
+                        self._publish_preview(frame, contours, motion_detected)
+                        last_preview_ns = now_ns
+
+                    # Act on key presses relayed by the preview thread
+                    if self._preview_quit_event.is_set():
+                        self.logger.info("Quit key pressed")
+                        break
+                    if self._reset_background_event.is_set():
+                        self._reset_background_event.clear()
+                        self.logger.info("Reset background")
+                        self.image_processor.background_initialized = False
+                    if self._manual_capture_event.is_set():
+                        self._manual_capture_event.clear()
+                        self.logger.info("Manual photo capture")
+                        self._handle_motion_detected(frame, contours)
 
                 # Performance monitoring
-                if self.settings.system.performance_monitoring and self.frame_count % 100 == 0:
+                if performance_monitoring and self.frame_count % 100 == 0:
                     self._log_performance_stats()
 
-                # Small delay to prevent excessive CPU usage
-                time.sleep(0.01)
-
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
         except Exception as e:
@@ -248,44 +369,50 @@ class MotionDetector:
         finally:
             self.stop()
 
-    def _handle_motion_detected(self, frame, contours) -> None:
-        """Handle motion detection event."""
+    def _handle_motion_detected(self, frame, contours, total_area=None) -> None:
+        """Handle motion detection event.
+
+        ``total_area`` is the area the processor already summed while
+        filtering contours; it is recomputed only when not supplied.
+        """
         assert self.file_manager is not None
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Check if enough time has passed since last photo
-        if current_time - self.last_photo_time < self.settings.storage.photo_delay:
+        if current_time - self.last_photo_time < self._hot.photo_delay:
             return
 
         try:
             # Calculate total motion area
-            total_area = sum(cv2.contourArea(contour) for contour in contours)
+            if total_area is None:
+                total_area = sum(cv2.contourArea(contour) for contour in contours)
 
             # Log motion detection
             self.motion_logger.log_motion_detected(total_area, len(contours))
 
-            # Save photo
+            # Save photo (and notify) on the writer thread. The frame may be
+            # a borrowed capture buffer, so queue a private copy.
             filename = self.file_manager.generate_filename(
                 "motion", self.settings.storage.photo_format
             )
-            filepath, file_size = self.file_manager.save_image(
-                frame, filename, quality=self.settings.storage.photo_quality
-            )
-
-            # Log photo saved
-            self.motion_logger.log_photo_saved(filepath, file_size)
-
-            # Send notification (rate-limited internally)
-            if self.notifier is not None:
-                self.notifier.notify_motion(total_area, len(contours), filepath)
+            job = (frame.copy(), filename, total_area, len(contours))
+            if self._writer_thread is None:
+                self._save_motion_photo(*job)
+            else:
+                try:
+                    self._save_queue.put_nowait(job)
+                except queue.Full:
+                    self.logger.warning(f"Photo writer busy, dropping {filename}")
 
             # Record a video clip in the background (skips if already recording)
             if self.video_recorder is not None and self.camera_manager is not None:
                 video_name = self.file_manager.generate_filename(
                     "motion", self.settings.storage.video_format
                 )
+                # peek_frame leaves the capture ring to the detection loop,
+                # which may still be using the frame it borrowed.
                 self.video_recorder.start_async(
-                    self.camera_manager.get_frame,
+                    self.camera_manager.peek_frame,
                     self.settings.storage.video_duration,
                     video_name,
                 )
@@ -296,29 +423,167 @@ class MotionDetector:
         except Exception as e:
             self.logger.error(f"Error handling motion detection: {e}")
 
+    def _save_motion_photo(self, frame, filename: str, total_area: float, contours: int) -> None:
+        """Save a motion photo, log it and send the notification."""
+        assert self.file_manager is not None
+        try:
+            filepath, file_size = self.file_manager.save_image(
+                frame, filename, quality=self.settings.storage.photo_quality
+            )
+
+            # Log photo saved
+            self.motion_logger.log_photo_saved(filepath, file_size)
+
+            # Send notification (rate-limited internally)
+            if self.notifier is not None:
+                self.notifier.notify_motion(total_area, contours, filepath)
+
+        except Exception as e:
+            self.logger.error(f"Error saving motion photo: {e}")
+
+    def _writer_loop(self) -> None:
+        """Drain the save queue until the stop sentinel (None) arrives."""
+        while True:
+            job = self._save_queue.get()
+            if job is None:
+                break
+            self._save_motion_photo(*job)
+
+    def _start_writer(self) -> None:
+        """Start the background photo writer thread."""
+        if self._writer_thread is not None:
+            return
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="PhotoWriter", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _stop_writer(self, timeout: float = 5.0) -> None:
+        """Let the writer finish queued photos, then stop it."""
+        if self._writer_thread is None:
+            return
+        try:
+            self._save_queue.put(None, timeout=timeout)
+        except queue.Full:
+            self.logger.warning("Photo writer did not drain; pending photos dropped")
+        self._writer_thread.join(timeout)
+        self._writer_thread = None
+
+    def _cleanup_loop(self, interval: float) -> None:
+        """Prune old photos every ``interval`` seconds until stopped."""
+        assert self.file_manager is not None
+        while not self.stop_event.wait(interval):
+            try:
+                self.file_manager.cleanup_old_files(self._hot.max_photos, max_age_days=30)
+            except Exception as e:
+                self.logger.error(f"Error during periodic cleanup: {e}")
+
+    def _start_cleanup(self) -> None:
+        """Start the periodic cleanup thread."""
+        if self._cleanup_thread is not None:
+            return
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_loop,
+            args=(self.settings.storage.cleanup_interval,),
+            name="Cleanup",
+            daemon=True,
+        )
+        self._cleanup_thread.start()
+
+    def _stop_cleanup(self, timeout: float = 5.0) -> None:
+        """Wait for the cleanup thread to notice stop_event and exit."""
+        if self._cleanup_thread is None:
+            return
+        self._cleanup_thread.join(timeout)
+        self._cleanup_thread = None
+
+    def _publish_preview(self, frame, contours, motion_detected) -> None:
+        """Copy the current frame and detection result into the preview slot."""
+        with self._preview_lock:
+            slot = self._preview_frame
+            if slot is None or slot.shape != frame.shape:
+                slot = self._preview_frame = np.empty_like(frame)
+            np.copyto(slot, frame)
+            self._preview_contours = contours
+            self._preview_motion = motion_detected
+            self._preview_seq += 1
+
+    def _preview_loop(self) -> None:
+        """Render published frames until asked to quit; owns all HighGUI calls."""
+        interval = 1.0 / self._hot.preview_fps
+        shown_seq = 0
+        try:
+            while not self._preview_quit_event.wait(interval):
+                with self._preview_lock:
+                    if self._preview_seq == shown_seq or self._preview_frame is None:
+                        continue
+                    shown_seq = self._preview_seq
+                    # Overlays are drawn on a reusable scratch copy.
+                    scratch = self._display_scratch
+                    if scratch is None or scratch.shape != self._preview_frame.shape:
+                        scratch = self._display_scratch = np.empty_like(self._preview_frame)
+                    np.copyto(scratch, self._preview_frame)
+                    contours = self._preview_contours
+                    motion_detected = self._preview_motion
+
+                self._display_preview(scratch, contours, motion_detected)
+        finally:
+            cv2.destroyAllWindows()
+
+    def _start_preview(self) -> None:
+        """Start the preview thread."""
+        if self._preview_thread is not None:
+            return
+        self._preview_quit_event.clear()
+        self._preview_thread = threading.Thread(
+            target=self._preview_loop, name="Preview", daemon=True
+        )
+        self._preview_thread.start()
+
+    def _stop_preview(self, timeout: float = 2.0) -> None:
+        """Stop the preview thread, which closes the window on exit."""
+        if self._preview_thread is None:
+            return
+        self._preview_quit_event.set()
+        self._preview_thread.join(timeout)
+        self._preview_thread = None
+
     def _display_preview(self, frame, contours, motion_detected) -> None:
-        """Display preview window with motion detection overlay."""
+        """Display preview window with motion detection overlay.
+
+        ``frame`` is the preview's own copy and may be drawn on. Key presses
+        are turned into events for the main loop.
+        """
         assert self.image_processor is not None and self.camera_manager is not None
+        hot = self._hot
         try:
-            display_frame = frame.copy()
+            # The scratch frame is ours, so overlays skip their defensive copies.
+            display_frame = frame
 
             # Draw contours if enabled
-            if self.settings.display.draw_contours:
-                display_frame = self.image_processor.draw_contours(display_frame, contours)
+            if hot.draw_contours:
+                display_frame = self.image_processor.draw_contours(
+                    display_frame, contours, inplace=True
+                )
 
             # Add overlay information
-            if self.settings.display.show_fps:
+            if hot.show_fps:
                 fps = self.camera_manager.performance_logger.metrics.get("fps", 0)
                 display_frame = self.image_processor.add_overlay_info(
-                    display_frame, motion_detected, fps
+                    display_frame, motion_detected, fps, inplace=True
                 )
 
             # Scale preview if needed
-            if self.settings.display.preview_scale != 1.0:
+            if hot.preview_scale != 1.0:
                 height, width = display_frame.shape[:2]
-                new_width = int(width * self.settings.display.preview_scale)
-                new_height = int(height * self.settings.display.preview_scale)
-                display_frame = cv2.resize(display_frame, (new_width, new_height))
+                new_width = int(width * hot.preview_scale)
+                new_height = int(height * hot.preview_scale)
+                resized = self._display_resized
+                if resized is None or resized.shape[:2] != (new_height, new_width):
+                    resized = self._display_resized = np.empty(
+                        (new_height, new_width) + display_frame.shape[2:], display_frame.dtype
+                    )
+                display_frame = cv2.resize(display_frame, (new_width, new_height), dst=resized)
 
             # Show preview
             cv2.imshow(self.settings.display.preview_window_name, display_frame)
@@ -326,23 +591,24 @@ class MotionDetector:
             # Handle key press
             key = cv2.waitKey(1) & 0xFF
             if key == ord("q"):
-                self.logger.info("Quit key pressed")
-                self.stop()
+                self._preview_quit_event.set()
             elif key == ord("r"):
-                self.logger.info("Reset background")
-                self.image_processor.background_initialized = False
+                self._reset_background_event.set()
             elif key == ord("s"):
-                self.logger.info("Manual photo capture")
-                self._handle_motion_detected(frame, contours)
+                self._manual_capture_event.set()
 
         except Exception as e:
             self.logger.error(f"Error displaying preview: {e}")
 
     def _log_performance_stats(self) -> None:
         """Log performance statistics."""
-        assert self.image_processor is not None
+        # Skip gathering statistics when INFO records would be discarded.
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        assert self.image_processor is not None and self.camera_manager is not None
         try:
-            uptime = time.time() - self.start_time
+            uptime = time.monotonic() - self.start_time
             fps = self.frame_count / uptime if uptime > 0 else 0
 
             # Get component statistics
@@ -350,10 +616,21 @@ class MotionDetector:
             motion_events = processing_stats.get("motion_detected_count", 0)
 
             self.logger.info(
-                f"Performance Stats - Uptime: {uptime:.1f}s, FPS: {fps:.1f}, "
-                f"Frames: {self.frame_count}, Motion Events: {motion_events}"
+                "Performance Stats - Uptime: %.1fs, FPS: %.1f, Frames: %d, Motion Events: %d",
+                uptime,
+                fps,
+                self.frame_count,
+                motion_events,
             )
 
+            capture_stats = self.camera_manager.get_capture_statistics()
+            if capture_stats:
+                self.logger.info(
+                    "Capture time - mean: %.2fms, p95: %.2fms",
+                    capture_stats["mean_ms"],
+                    capture_stats["p95_ms"],
+                )
+
         except Exception as e:
             self.logger.error(f"Error logging performance stats: {e}")
 
@@ -364,15 +641,19 @@ class MotionDetector:
 
         self.motion_logger.log_system_event("Motion detection stopping")
         self.is_running = False
+        self.stop_event.set()
 
         try:
             # Stop camera streaming
             if self.camera_manager:
                 self.camera_manager.stop_streaming()
 
-            # Close preview window
-            if self.settings.display.show_preview:
-                cv2.destroyAllWindows()
+            # Flush pending motion photos
+            self._stop_writer()
+            self._stop_cleanup()
+
+            # Stop the preview thread (it closes the window)
+            self._stop_preview()
 
             # Log final statistics
             self._log_final_statistics()
@@ -385,7 +666,7 @@ class MotionDetector:
     def _log_final_statistics(self) -> None:
         """Log final system statistics."""
         try:
-            uptime = time.time() - self.start_time
+            uptime = time.monotonic() - self.start_time
             average_fps = self.frame_count / uptime if uptime > 0 else 0
 
             # Get final statistics from all components
@@ -434,7 +715,7 @@ class MotionDetector:
         return {
             "is_running": self.is_running,
             "is_initialized": self.is_initialized,
-            "uptime": time.time() - self.start_time if self.is_running else 0,
+            "uptime": time.monotonic() - self.start_time if self.is_running else 0,
             "frame_count": self.frame_count,
             "camera_info": self.camera_manager.get_camera_info() if self.camera_manager else {},
             "processing_stats": (
@@ -6,17 +6,46 @@ Professional image processing for motion detection with optimized algorithms.
 import cv2
 import numpy as np
 import time
+from dataclasses import dataclass
 from typing import List, Tuple, Optional
 import logging
 
 from ..utils.logger import PerformanceLogger
 
+# cv2.hasNonZero (OpenCV 4.7+) stops at the first set pixel.
+_has_non_zero = getattr(cv2, "hasNonZero", None) or (lambda mask: cv2.countNonZero(mask) > 0)
+
+
+@dataclass(slots=True)
+class ProcStats:
+    """Per-frame detection counters; the average is derived on demand."""
+
+    frames_processed: int = 0
+    motion_detected_count: int = 0
+    total_processing_time_ns: int = 0
+
+    @property
+    def average_processing_time_ms(self) -> float:
+        return self.total_processing_time_ns / 1e6 / max(1, self.frames_processed)
+
+    def to_dict(self) -> dict:
+        """Statistics in the dict form reported by the processor (times in ms)."""
+        return {
+            "frames_processed": self.frames_processed,
+            "motion_detected_count": self.motion_detected_count,
+            "average_processing_time": self.average_processing_time_ms,
+            "total_processing_time": self.total_processing_time_ns / 1e6,
+        }
+
 
 class ImageProcessor:
     """
     Professional image processing for motion detection.
     """
 
+    # Per-frame running-average weight of the frame_diff background model.
+    DEFAULT_LEARNING_RATE = 0.05
+
     def __init__(self, config, logger: Optional[logging.Logger] = None):
         """
         Initialize image processor.
@@ -33,23 +62,77 @@ class ImageProcessor:
         # OpenCV background subtractor ("mog2" / "knn"), which adapt better to
         # gradual lighting changes.
         self.algorithm = getattr(config, "algorithm", "frame_diff")
+        self.detect_shadows = bool(getattr(config, "detect_shadows", True))
         self._bg_subtractor = self._create_subtractor(self.algorithm)
 
-        # Background subtraction (frame_diff mode)
+        # Structuring element and blur sizes reused by every frame
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+        self.blur_method = getattr(config, "blur_method", "gaussian")
+        if self.blur_method == "stack" and not hasattr(cv2, "stackBlur"):
+            self.logger.warning("cv2.stackBlur needs OpenCV 4.7+; using box blur")
+            self.blur_method = "box"
+        self._set_blur_size(config.blur_kernel_size)
+
+        # Background subtraction (frame_diff mode). The running average is
+        # kept in float32 so small learning rates are not lost to uint8
+        # rounding; background_frame is its uint8 copy used for differencing.
+        self._background_f32: Optional[np.ndarray] = None
         self.background_frame: Optional[np.ndarray] = None
         self.background_initialized = False
 
+        # Summed area of the significant contours from the last detect_motion
+        # call, so callers need not recompute contourArea per contour.
+        self.last_motion_area = 0.0
+
+        # Per-frame working images, reused while the frame shape is unchanged
+        # (see _ensure_buffers). None lets OpenCV allocate, as for UMat input.
+        self._buffer_shape: Optional[tuple] = None
+        self._gray: Optional[np.ndarray] = None
+        self._delta: Optional[np.ndarray] = None
+
+        # The last frame given to detect_motion and its preprocessed image, so
+        # update_background on the same frame object skips preprocessing.
+        self._last_detect_input: Optional[np.ndarray] = None
+        self._last_detect_processed: Optional[np.ndarray] = None
+
         # Region-of-interest mask, built lazily and cached per frame shape.
         self._roi_mask: Optional[np.ndarray] = None
         self._roi_shape: Optional[tuple] = None
+        self._roi_scale = 1.0
 
         # Processing statistics
-        self.processing_stats = {
-            "frames_processed": 0,
-            "motion_detected_count": 0,
-            "average_processing_time": 0.0,
-            "total_processing_time": 0.0,
-        }
+        self.processing_stats = ProcStats()
+
+    def _set_blur_size(self, kernel_size: int) -> None:
+        """Cache the Gaussian kernel size and its three-pass box equivalent."""
+        self._blur_ksize = (kernel_size, kernel_size)
+        # Sigma OpenCV derives for a Gaussian of this size; three box passes
+        # of width w have variance 3 * (w * w - 1) / 12, solved for w (odd).
+        sigma = 0.3 * ((kernel_size - 1) * 0.5 - 1) + 0.8
+        width = max(1, int(round((4 * sigma * sigma + 1) ** 0.5)))
+        width += 1 - width % 2
+        self._box_ksize = (width, width)
+
+    def _ensure_buffers(self, frame: np.ndarray) -> None:
+        """Size the reusable working images for ``frame``.
+
+        Buffers are reallocated only when the frame shape changes. OpenCL
+        (UMat) frames keep their intermediates on the device, so the host
+        buffers are dropped and OpenCV allocates as before.
+        """
+        if isinstance(frame, cv2.UMat):
+            shape = None
+        else:
+            shape = frame.shape[:2]
+        if shape == self._buffer_shape:
+            return
+
+        self._buffer_shape = shape
+        if shape is None:
+            self._gray = self._delta = None
+        else:
+            self._gray = np.empty(shape, dtype=np.uint8)
+            self._delta = np.empty(shape, dtype=np.uint8)
 
     def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
         """
@@ -59,20 +142,28 @@ class ImageProcessor:
             frame: Input frame
 
         Returns:
-            np.ndarray: Preprocessed frame
+            np.ndarray: Preprocessed frame. It is a reused buffer, valid
+            until the next call; copy it to keep it.
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            self._ensure_buffers(frame)
 
-            # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(
-                gray, (self.config.blur_kernel_size, self.config.blur_kernel_size), 0
-            )
+            # Convert to grayscale
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+            # Blur to reduce noise, in place
+            if self.blur_method == "stack":
+                blurred = cv2.stackBlur(gray, self._blur_ksize, dst=gray)
+            elif self.blur_method == "box":
+                blurred = gray
+                for _ in range(3):
+                    blurred = cv2.boxFilter(blurred, -1, self._box_ksize, dst=blurred)
+            else:
+                blurred = cv2.GaussianBlur(gray, self._blur_ksize, 0, dst=gray)
 
-            processing_time = (time.time() - start_time) * 1000
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e6
             self.performance_logger.log_processing_time("preprocess", processing_time)
 
             return blurred
@@ -89,17 +180,27 @@ class ImageProcessor:
             frame: Initial frame to use as background
         """
         try:
-            self.background_frame = self.preprocess_frame(frame)
+            processed_frame = self.preprocess_frame(frame)
+            # cv2.multiply rather than astype so OpenCL (UMat) frames work too.
+            self._background_f32 = cv2.multiply(processed_frame, 1.0, dtype=cv2.CV_32F)
+            # A private uint8 copy: the preprocessed frame is a reused buffer.
+            self.background_frame = cv2.convertScaleAbs(self._background_f32)
             self.background_initialized = True
             self.logger.info("Background frame initialized")
 
         except Exception as e:
             self.logger.error(f"Background initialization failed: {e}")
 
-    def update_background(self, frame: np.ndarray, learning_rate: float = 0.05) -> None:
+    def update_background(
+        self, frame: np.ndarray, learning_rate: float = DEFAULT_LEARNING_RATE
+    ) -> None:
         """
         Update background frame using running average.
 
+        Passing the same frame object that was just given to
+        :meth:`detect_motion` reuses its preprocessed image, so the frame must
+        not be modified between the two calls.
+
         Args:
             frame: Current frame
             learning_rate: Learning rate for background update
@@ -113,11 +214,17 @@ class ImageProcessor:
             return
 
         try:
-            processed_frame = self.preprocess_frame(frame)
-
-            # Update background using weighted average
-            self.background_frame = cv2.addWeighted(
-                self.background_frame, 1 - learning_rate, processed_frame, learning_rate, 0
+            if frame is self._last_detect_input:
+                processed_frame = self._last_detect_processed
+            else:
+                processed_frame = self.preprocess_frame(frame)
+            self._last_detect_input = self._last_detect_processed = None
+
+            # Update the float running average in place, then refresh the
+            # uint8 copy into its existing buffer.
+            cv2.accumulateWeighted(processed_frame, self._background_f32, learning_rate)
+            self.background_frame = cv2.convertScaleAbs(
+                self._background_f32, dst=self.background_frame
             )
 
         except Exception as e:
@@ -127,34 +234,61 @@ class ImageProcessor:
         """Create an OpenCV background subtractor, or None for frame_diff."""
         try:
             if algorithm == "mog2":
-                return cv2.createBackgroundSubtractorMOG2(detectShadows=True)
+                return cv2.createBackgroundSubtractorMOG2(detectShadows=self.detect_shadows)
             if algorithm == "knn":
-                return cv2.createBackgroundSubtractorKNN(detectShadows=True)
+                return cv2.createBackgroundSubtractorKNN(detectShadows=self.detect_shadows)
         except Exception as e:
             self.logger.error(f"Failed to create '{algorithm}' subtractor: {e}")
         return None
 
     def _subtractor_mask(self, processed_frame: np.ndarray) -> np.ndarray:
         """Apply the background subtractor and drop shadow pixels."""
-        foreground = self._bg_subtractor.apply(processed_frame)
+        foreground = self._bg_subtractor.apply(processed_frame, self._delta)
+        if not self.detect_shadows:
+            # Without shadow detection the mask is already 0/255.
+            return foreground
         # Subtractors mark shadows as gray (127); keep only solid foreground.
-        return cv2.threshold(foreground, 200, 255, cv2.THRESH_BINARY)[1]
+        return cv2.threshold(foreground, 200, 255, cv2.THRESH_BINARY, dst=foreground)[1]
+
+    def _clean_mask(self, thresh: np.ndarray) -> np.ndarray:
+        """Close, open, then dilate the binary motion mask in place.
 
-    def detect_motion(self, frame: np.ndarray) -> Tuple[bool, List[np.ndarray], np.ndarray]:
+        With a rectangular kernel the sequence close -> open -> dilate(n)
+        (dilate, erode, erode, dilate, dilate x n) collapses to three passes:
+        consecutive erosions and dilations merge into single iterated calls.
+        Each pass writes back into ``thresh``, so no intermediate images are
+        allocated.
+        """
+        kernel = self._morph_kernel
+        cv2.dilate(thresh, kernel, dst=thresh)
+        cv2.erode(thresh, kernel, dst=thresh, iterations=2)
+        cv2.dilate(thresh, kernel, dst=thresh, iterations=1 + self.config.dilate_iterations)
+        return thresh
+
+    def detect_motion(
+        self, frame: np.ndarray, scale: float = 1.0
+    ) -> Tuple[bool, List[np.ndarray], np.ndarray]:
         """
         Detect motion in frame compared to background.
 
         Args:
             frame: Current frame
+            scale: Factor ``frame`` was downscaled by from full resolution.
+                Areas, thresholds and regions stay in full-resolution pixels
+                and the returned contours are mapped back to full resolution.
 
         Returns:
             Tuple[bool, List[np.ndarray], np.ndarray]: (motion_detected, contours, diff_image)
+            where diff_image is a reused buffer, valid until the next call
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        self.last_motion_area = 0.0
 
         try:
             # Preprocess current frame
             processed_frame = self.preprocess_frame(frame)
+            self._last_detect_input = frame
+            self._last_detect_processed = processed_frame
 
             # Produce a binary motion mask using the configured algorithm.
             if self._bg_subtractor is not None:
@@ -166,51 +300,64 @@ class ImageProcessor:
                     return False, [], processed_frame
 
                 # Calculate frame difference
-                frame_delta = cv2.absdiff(self.background_frame, processed_frame)
+                frame_delta = cv2.absdiff(self.background_frame, processed_frame, dst=self._delta)
                 thresh = cv2.threshold(
-                    frame_delta, self.config.delta_threshold, 255, cv2.THRESH_BINARY
+                    frame_delta,
+                    self.config.delta_threshold,
+                    255,
+                    cv2.THRESH_BINARY,
+                    dst=frame_delta,
                 )[1]
 
-            # Morphological operations to clean up the image
-            kernel = np.ones((3, 3), np.uint8)
-            thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-            thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
-
-            # Dilate to fill holes in contours
-            dilated = cv2.dilate(thresh, None, iterations=self.config.dilate_iterations)
+            if _has_non_zero(thresh):
+                # Clean up the mask and dilate to fill holes in contours
+                dilated = self._clean_mask(thresh)
 
-            # Restrict detection to the configured regions of interest.
-            roi_mask = self._get_roi_mask(dilated.shape)
-            if roi_mask is not None:
-                dilated = cv2.bitwise_and(dilated, roi_mask)
+                # Contour tracing runs on the CPU; download an OpenCL (UMat)
+                # mask once here rather than implicitly in each call below.
+                if isinstance(dilated, cv2.UMat):
+                    dilated = dilated.get()
 
-            # Find contours
-            contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                # Restrict detection to the configured regions of interest.
+                roi_mask = self._get_roi_mask(dilated.shape, scale)
+                if roi_mask is not None:
+                    dilated = cv2.bitwise_and(dilated, roi_mask, dst=dilated)
 
-            # Filter contours by area
-            significant_contours = []
-            total_area = 0
-
-            for contour in contours:
-                area = cv2.contourArea(contour)
-                if area > self.config.min_area:
-                    significant_contours.append(contour)
-                    total_area += area
+                # Find contours
+                contours, _ = cv2.findContours(dilated, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            else:
+                # A static scene leaves an empty mask, which stays empty
+                # through morphology; skip it and contour tracing.
+                dilated = thresh.get() if isinstance(thresh, cv2.UMat) else thresh
+                contours = ()
+
+            # Filter contours by area, measured in full-resolution pixels
+            areas = np.fromiter(map(cv2.contourArea, contours), np.float64, len(contours))
+            if scale != 1.0:
+                areas *= 1.0 / (scale * scale)
+            keep = areas > self.config.min_area
+            significant_contours = [c for c, k in zip(contours, keep) if k]
+            total_area = float(areas[keep].sum())
+
+            if scale != 1.0:
+                inverse = 1.0 / scale
+                significant_contours = [
+                    (contour * inverse).astype(np.int32) for contour in significant_contours
+                ]
 
             # Determine if motion detected
             motion_detected = total_area > self.config.motion_threshold
+            self.last_motion_area = total_area
 
             # Update statistics
-            self.processing_stats["frames_processed"] += 1
+            stats = self.processing_stats
+            stats.frames_processed += 1
             if motion_detected:
-                self.processing_stats["motion_detected_count"] += 1
+                stats.motion_detected_count += 1
 
-            processing_time = (time.time() - start_time) * 1000
-            self.processing_stats["total_processing_time"] += processing_time
-            self.processing_stats["average_processing_time"] = (
-                self.processing_stats["total_processing_time"]
-                / self.processing_stats["frames_processed"]
-            )
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            stats.total_processing_time_ns += elapsed_ns
+            processing_time = elapsed_ns / 1e6
 
             self.performance_logger.log_processing_time("motion_detection", processing_time)
             self.performance_logger.log_detection_stats(len(significant_contours), motion_detected)
@@ -218,16 +365,18 @@ class ImageProcessor:
             if motion_detected:
                 contour_count = len(significant_contours)
                 self.logger.debug(
-                    f"Motion detected - Total area: {total_area:.0f}, Contours: {contour_count}"
+                    "Motion detected - Total area: %.0f, Contours: %d", total_area, contour_count
                 )
 
             return motion_detected, significant_contours, dilated
 
         except Exception as e:
             self.logger.error(f"Motion detection failed: {e}")
+            if isinstance(frame, cv2.UMat):
+                frame = frame.get()
             return False, [], np.zeros_like(frame[:, :, 0])
 
-    def _get_roi_mask(self, shape: tuple) -> Optional[np.ndarray]:
+    def _get_roi_mask(self, shape: tuple, scale: float = 1.0) -> Optional[np.ndarray]:
         """Return a binary mask for the configured regions, or None.
 
         The mask is built once per frame shape and cached. When no regions are
@@ -235,6 +384,8 @@ class ImageProcessor:
 
         Args:
             shape: (height, width) of the binary motion image.
+            scale: Factor the motion image was downscaled by; regions are
+                given in full-resolution pixels and scaled to match.
 
         Returns:
             Optional[np.ndarray]: uint8 mask (255 inside regions) or None.
@@ -243,14 +394,14 @@ class ImageProcessor:
         if not regions:
             return None
 
-        if self._roi_mask is not None and self._roi_shape == shape:
+        if self._roi_mask is not None and self._roi_shape == shape and self._roi_scale == scale:
             return self._roi_mask
 
         height, width = shape[:2]
         mask = np.zeros((height, width), dtype=np.uint8)
         for region in regions:
             try:
-                x, y, w, h = (int(v) for v in region)
+                x, y, w, h = (int(round(float(v) * scale)) for v in region)
             except (TypeError, ValueError):
                 self.logger.warning(f"Ignoring malformed ROI region: {region}")
                 continue
@@ -262,21 +413,27 @@ class ImageProcessor:
 
         self._roi_mask = mask
         self._roi_shape = shape
+        self._roi_scale = scale
         return mask
 
-    def draw_contours(self, frame: np.ndarray, contours: List[np.ndarray]) -> np.ndarray:
+    def draw_contours(
+        self, frame: np.ndarray, contours: List[np.ndarray], inplace: bool = False
+    ) -> np.ndarray:
         """
         Draw contours on frame for visualization.
 
         Args:
             frame: Original frame
             contours: List of contours to draw
+            inplace: Draw directly on ``frame`` instead of on a copy
 
         Returns:
             np.ndarray: Frame with contours drawn
         """
         try:
-            frame_copy = frame.copy()
+            frame_copy = frame if inplace else frame.copy()
+            if not contours:
+                return frame_copy
 
             for contour in contours:
                 # Draw bounding rectangle
@@ -295,8 +452,8 @@ class ImageProcessor:
                     1,
                 )
 
-                # Draw contour outline
-                cv2.drawContours(frame_copy, [contour], -1, (0, 0, 255), 2)
+            # Draw every contour outline in one call
+            cv2.polylines(frame_copy, contours, True, (0, 0, 255), 2)
 
             return frame_copy
 
@@ -305,7 +462,7 @@ class ImageProcessor:
             return frame
 
     def add_overlay_info(
-        self, frame: np.ndarray, motion_detected: bool, fps: float = 0.0
+        self, frame: np.ndarray, motion_detected: bool, fps: float = 0.0, inplace: bool = False
     ) -> np.ndarray:
         """
         Add overlay information to frame.
@@ -314,12 +471,13 @@ class ImageProcessor:
             frame: Input frame
             motion_detected: Whether motion was detected
             fps: Current FPS
+            inplace: Draw directly on ``frame`` instead of on a copy
 
         Returns:
             np.ndarray: Frame with overlay information
         """
         try:
-            frame_copy = frame.copy()
+            frame_copy = frame if inplace else frame.copy()
 
             # Status text
             status_text = "MOTION DETECTED!" if motion_detected else "Monitoring..."
@@ -342,7 +500,7 @@ class ImageProcessor:
                 )
 
             # Processing statistics
-            stats_text = f"Frames: {self.processing_stats['frames_processed']}"
+            stats_text = f"Frames: {self.processing_stats.frames_processed}"
             cv2.putText(
                 frame_copy,
                 stats_text,
@@ -353,7 +511,7 @@ class ImageProcessor:
                 1,
             )
 
-            motion_text = f"Motion Events: {self.processing_stats['motion_detected_count']}"
+            motion_text = f"Motion Events: {self.processing_stats.motion_detected_count}"
             cv2.putText(
                 frame_copy,
                 motion_text,
@@ -377,16 +535,11 @@ class ImageProcessor:
         Returns:
             dict: Processing statistics
         """
-        return self.processing_stats.copy()
+        return self.processing_stats.to_dict()
 
     def reset_statistics(self) -> None:
         """Reset processing statistics."""
-        self.processing_stats = {
-            "frames_processed": 0,
-            "motion_detected_count": 0,
-            "average_processing_time": 0.0,
-            "total_processing_time": 0.0,
-        }
+        self.processing_stats = ProcStats()
         self.performance_logger.reset_metrics()
 
     def optimize_for_raspberry_pi(self) -> None:
@@ -394,6 +547,7 @@ class ImageProcessor:
         # Reduce blur kernel size for better performance
         if self.config.blur_kernel_size > 15:
             self.config.blur_kernel_size = 15
+            self._set_blur_size(15)
             self.logger.info("Reduced blur kernel size for Raspberry Pi optimization")
 
         # Reduce dilate iterations
@@ -401,9 +555,16 @@ class ImageProcessor:
             self.config.dilate_iterations = 1
             self.logger.info("Reduced dilate iterations for Raspberry Pi optimization")
 
+        # Refresh the background model every third frame
+        if self.config.background_update_interval == 1:
+            self.config.background_update_interval = 3
+            self.logger.info("Reduced background update rate for Raspberry Pi optimization")
+
     def cleanup(self) -> None:
         """Clean up processor resources."""
         self.background_frame = None
+        self._background_f32 = None
+        self._last_detect_input = self._last_detect_processed = None
         self.background_initialized = False
         self.reset_statistics()
         self.logger.info("Image processor cleanup completed")
@@ -3,13 +3,22 @@ File Management Utility
 Professional file operations for motion detection system.
 """
 
+import os
 import shutil
 import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import logging
 from datetime import datetime
 
+try:  # Optional libjpeg-turbo binding; cv2.imwrite is used without it.
+    from turbojpeg import TurboJPEG
+except ImportError:  # pragma: no cover - depends on optional package
+    TurboJPEG = None
+
+# Encode quality used when none is requested (OpenCV's JPEG default).
+DEFAULT_JPEG_QUALITY = 95
+
 
 class FileManager:
     """
@@ -27,6 +36,23 @@ class FileManager:
         self.base_directory = Path(base_directory)
         self.logger = logger or logging.getLogger(__name__)
 
+        # JPEG encoder from libjpeg-turbo (NEON-accelerated on the Pi), or
+        # None to encode through cv2.imwrite.
+        self._jpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._jpeg = TurboJPEG()
+            except Exception as e:  # the shared library may be missing
+                self.logger.warning(f"TurboJPEG unavailable, using OpenCV encoder: {e}")
+
+        # (epoch second, "YYYYmmdd_HHMMSS") so bursts of saves within one
+        # second format the calendar fields only once.
+        self._second_stamp: Tuple[int, str] = (-1, "")
+        # Per (prefix, extension): millisecond of the last name handed out and
+        # how many names have shared it, to keep names unique within a
+        # millisecond. Keyed by both so a photo and its clip share a stem.
+        self._millis_seq: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
         # Ensure base directory exists
         self.ensure_directory_exists(self.base_directory)
 
@@ -55,8 +81,22 @@ class FileManager:
         Returns:
             str: Generated filename
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
-        return f"{prefix}_{timestamp}.{extension}"
+        now_ns = time.time_ns()
+        second = now_ns // 1_000_000_000
+        if second != self._second_stamp[0]:
+            self._second_stamp = (second, time.strftime("%Y%m%d_%H%M%S", time.localtime(second)))
+        total_millis = now_ns // 1_000_000
+        stamp = f"{self._second_stamp[1]}_{total_millis % 1000:03d}"  # Include milliseconds
+        key = (prefix, extension)
+        last_millis, seq = self._millis_seq.get(key, (-1, 0))
+        if total_millis == last_millis:
+            # Same millisecond as the previous identical name: add a suffix.
+            seq += 1
+            stamp = f"{stamp}_{seq:03d}"
+        else:
+            seq = 0
+        self._millis_seq[key] = (total_millis, seq)
+        return f"{prefix}_{stamp}.{extension}"
 
     def save_image(
         self,
@@ -82,17 +122,28 @@ class FileManager:
         filepath = self.base_directory / filename
 
         try:
-            # Save image (assuming OpenCV format)
-            import cv2
+            if self._jpeg is not None and filepath.suffix.lower() in (".jpg", ".jpeg"):
+                # Encode in memory and write the bytes; the size is known
+                # without a stat call.
+                data = self._jpeg.encode(
+                    image_data,
+                    quality=DEFAULT_JPEG_QUALITY if quality is None else max(1, min(100, quality)),
+                )
+                with open(filepath, "wb") as fh:
+                    fh.write(data)
+                file_size = len(data)
+            else:
+                # Save image (assuming OpenCV format)
+                import cv2
 
-            encode_params = self._build_encode_params(filepath.suffix, quality)
-            success = cv2.imwrite(str(filepath), image_data, encode_params)
+                encode_params = self._build_encode_params(filepath.suffix, quality)
+                success = cv2.imwrite(str(filepath), image_data, encode_params)
 
-            if not success:
-                raise RuntimeError("Failed to save image")
+                if not success:
+                    raise RuntimeError("Failed to save image")
 
-            file_size = filepath.stat().st_size
-            self.logger.debug(f"Image saved: {filepath} ({file_size} bytes)")
+                file_size = filepath.stat().st_size
+            self.logger.debug("Image saved: %s (%d bytes)", filepath, file_size)
 
             return str(filepath), file_size
 
@@ -146,33 +197,31 @@ class FileManager:
             int: Number of files deleted
         """
         try:
-            files = list(self.base_directory.glob("*.jpg"))
-            files.extend(self.base_directory.glob("*.png"))
+            # One directory scan; DirEntry caches its stat() result, so each
+            # file is stat'd once for sorting and the age check.
+            with os.scandir(self.base_directory) as it:
+                entries = [e for e in it if e.name.endswith((".jpg", ".png")) and e.is_file()]
 
             # Sort by modification time (newest first)
-            files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
 
             deleted_count = 0
             cutoff_time = time.time() - (max_age_days * 24 * 60 * 60)
 
-            # Delete files beyond max_files limit
-            for file in files[max_files:]:
+            # Delete files beyond the max_files limit or older than max_age_days
+            for index, entry in enumerate(entries):
+                if index >= max_files:
+                    reason = "count limit"
+                elif entry.stat().st_mtime < cutoff_time:
+                    reason = "age limit"
+                else:
+                    continue
                 try:
-                    file.unlink()
+                    os.unlink(entry.path)
                     deleted_count += 1
-                    self.logger.debug(f"Deleted old file (count limit): {file}")
+                    self.logger.debug(f"Deleted old file ({reason}): {entry.path}")
                 except Exception as e:
-                    self.logger.warning(f"Failed to delete file {file}: {e}")
-
-            # Delete files older than max_age_days
-            for file in files[:max_files]:
-                if file.stat().st_mtime < cutoff_time:
-                    try:
-                        file.unlink()
-                        deleted_count += 1
-                        self.logger.debug(f"Deleted old file (age limit): {file}")
-                    except Exception as e:
-                        self.logger.warning(f"Failed to delete file {file}: {e}")
+                    self.logger.warning(f"Failed to delete file {entry.path}: {e}")
 
             if deleted_count > 0:
                 self.logger.info(f"Cleanup completed: {deleted_count} files deleted")
@@ -191,10 +240,24 @@ class FileManager:
             dict: File statistics
         """
         try:
-            files = list(self.base_directory.glob("*"))
-            image_files = [f for f in files if f.suffix.lower() in [".jpg", ".jpeg", ".png"]]
-
-            if not image_files:
+            # Count, size and oldest/newest in a single scan and stat per file.
+            total_files = 0
+            total_size = 0
+            oldest: Optional[Tuple[float, str]] = None
+            newest: Optional[Tuple[float, str]] = None
+            with os.scandir(self.base_directory) as it:
+                for entry in it:
+                    if os.path.splitext(entry.name)[1].lower() not in (".jpg", ".jpeg", ".png"):
+                        continue
+                    st = entry.stat()
+                    total_files += 1
+                    total_size += st.st_size
+                    if oldest is None or st.st_mtime < oldest[0]:
+                        oldest = (st.st_mtime, entry.name)
+                    if newest is None or st.st_mtime > newest[0]:
+                        newest = (st.st_mtime, entry.name)
+
+            if oldest is None or newest is None:
                 return {
                     "total_files": 0,
                     "total_size_mb": 0,
@@ -202,20 +265,16 @@ class FileManager:
                     "newest_file": None,
                 }
 
-            total_size = sum(f.stat().st_size for f in image_files)
-            oldest_file = min(image_files, key=lambda x: x.stat().st_mtime)
-            newest_file = max(image_files, key=lambda x: x.stat().st_mtime)
-
             return {
-                "total_files": len(image_files),
+                "total_files": total_files,
                 "total_size_mb": total_size / (1024 * 1024),
                 "oldest_file": {
-                    "name": oldest_file.name,
-                    "date": datetime.fromtimestamp(oldest_file.stat().st_mtime).isoformat(),
+                    "name": oldest[1],
+                    "date": datetime.fromtimestamp(oldest[0]).isoformat(),
                 },
                 "newest_file": {
-                    "name": newest_file.name,
-                    "date": datetime.fromtimestamp(newest_file.stat().st_mtime).isoformat(),
+                    "name": newest[1],
+                    "date": datetime.fromtimestamp(newest[0]).isoformat(),
                 },
             }
 
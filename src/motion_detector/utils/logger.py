@@ -71,6 +71,9 @@ def setup_logger(
 class PerformanceLogger:
     """
     Performance monitoring logger for tracking system metrics.
+
+    These methods run per frame, so messages use %-style arguments and are
+    only formatted when DEBUG records are actually emitted.
     """
 
     def __init__(self, logger: logging.Logger):
@@ -86,24 +89,24 @@ class PerformanceLogger:
     def log_fps(self, fps: float) -> None:
         """Log frames per second."""
         self.metrics["fps"] = fps
-        self.logger.debug(f"FPS: {fps:.2f}")
+        self.logger.debug("FPS: %.2f", fps)
 
     def log_processing_time(self, operation: str, time_ms: float) -> None:
         """Log processing time for an operation."""
         self.metrics[f"{operation}_time"] = time_ms
-        self.logger.debug(f"{operation} processing time: {time_ms:.2f}ms")
+        self.logger.debug("%s processing time: %.2fms", operation, time_ms)
 
     def log_memory_usage(self, memory_mb: float) -> None:
         """Log memory usage."""
         self.metrics["memory_mb"] = memory_mb
-        self.logger.debug(f"Memory usage: {memory_mb:.2f}MB")
+        self.logger.debug("Memory usage: %.2fMB", memory_mb)
 
     def log_detection_stats(self, contours_found: int, motion_detected: bool) -> None:
         """Log detection statistics."""
         self.metrics["contours_found"] = contours_found
         self.metrics["motion_detected"] = motion_detected
         self.logger.debug(
-            f"Detection stats - Contours: {contours_found}, Motion: {motion_detected}"
+            "Detection stats - Contours: %d, Motion: %s", contours_found, motion_detected
         )
 
     def get_metrics_summary(self) -> dict:
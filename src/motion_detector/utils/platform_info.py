@@ -0,0 +1,22 @@
+"""
+Host Platform Facts
+Values that cannot change while the process runs, evaluated once at import.
+"""
+
+import platform
+
+SYSTEM = platform.system()
+MACHINE = platform.machine()
+PYTHON_VERSION = platform.python_version()
+
+
+def is_arm_machine(machine: str) -> bool:
+    """Return True for ARM machine names.
+
+    32-bit Raspberry Pi OS reports e.g. "armv7l"; the 64-bit release reports
+    "aarch64", which does not start with "arm".
+    """
+    return machine.startswith(("arm", "aarch64"))
+
+
+IS_ARM = is_arm_machine(MACHINE)
@@ -3,133 +3,359 @@ Validation Utilities
 Professional validation functions for configuration and system checks.
 """
 
-import cv2
 import os
-import platform
 import psutil
-from typing import List, Tuple, Optional
+import queue
+import shutil
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import takewhile
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Tuple, Optional
 import logging
 
+from ..config.defaults import VALID_LOG_LEVELS
+from .platform_info import IS_ARM as _IS_ARM
+from .platform_info import MACHINE as _MACHINE
+from .platform_info import PYTHON_VERSION as _PYVER
+from .platform_info import SYSTEM as _SYSTEM
 
-def validate_config(config) -> Tuple[bool, List[str]]:
-    """
-    Validate configuration settings.
+try:  # POSIX only; the V4L2 probe falls back to OpenCV without it.
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
 
-    Args:
-        config: Configuration object to validate
+# Result of the last camera probe in this process. Opening the camera is by
+# far the slowest diagnostic, so callers that only need a sanity check (e.g.
+# detector start-up right after the CLI already probed) can reuse it.
+_camera_probe_result: Optional[Tuple[bool, str]] = None
+
+# Upper bound on how long diagnostics wait for the camera probe.
+CAMERA_PROBE_TIMEOUT = 10.0
+
+_MIB = 1024 * 1024
+_GIB = 1024 * _MIB
+# Available memory / free root-disk space below these trigger a warning.
+_MIN_AVAIL_BYTES = 512 * _MIB
+_MIN_FREE_DISK_BYTES = _GIB
+
+# System samples (memory, disk, CPU count) reused for a few seconds, so the
+# validators and diagnostics run back to back share one reading.
+SAMPLE_TTL = 5.0
+_samples: Dict[str, Tuple[float, Any]] = {}
+
+
+def _cached(key: str, sample: Callable[[], Any], ttl: float = SAMPLE_TTL) -> Any:
+    """Return ``sample()``, reusing a value taken less than ``ttl`` seconds ago."""
+    now = time.monotonic()
+    hit = _samples.get(key)
+    if hit is not None and now - hit[0] < ttl:
+        return hit[1]
+    value = sample()
+    _samples[key] = (now, value)
+    return value
 
-    Returns:
-        Tuple[bool, List[str]]: (is_valid, error_messages)
-    """
-    errors = []
 
-    # Validate camera configuration
-    if config.camera.resolution[0] <= 0 or config.camera.resolution[1] <= 0:
-        errors.append("Camera resolution must be positive integers")
+def _virtual_memory():
+    return _cached("virtual_memory", psutil.virtual_memory)
 
-    if config.camera.framerate <= 0:
-        errors.append("Camera framerate must be positive")
 
-    if config.camera.warmup_time < 0:
-        errors.append("Camera warmup time cannot be negative")
+def _root_disk_usage():
+    # shutil wraps statvfs directly; psutil adds nothing for the free-space check.
+    return _cached("disk_usage", lambda: shutil.disk_usage("/"))
 
-    # Validate detection configuration
-    if config.detection.motion_threshold <= 0:
-        errors.append("Motion threshold must be positive")
 
-    if config.detection.min_area <= 0:
-        errors.append("Minimum area must be positive")
+def _cpu_count() -> int:
+    return _cached("cpu_count", psutil.cpu_count, ttl=float("inf")) or 1
 
-    if config.detection.blur_kernel_size <= 0 or config.detection.blur_kernel_size % 2 == 0:
-        errors.append("Blur kernel size must be positive and odd")
 
-    if config.detection.delta_threshold < 0 or config.detection.delta_threshold > 255:
-        errors.append("Delta threshold must be between 0 and 255")
+def _cpu_percent() -> float:
+    """CPU utilization since the previous sample, without blocking."""
+    return _cached("cpu_percent", lambda: psutil.cpu_percent(interval=None))
 
-    # Validate storage configuration
-    if config.storage.photo_delay < 0:
-        errors.append("Photo delay cannot be negative")
 
-    if config.storage.photo_quality < 1 or config.storage.photo_quality > 100:
-        errors.append("Photo quality must be between 1 and 100")
+def _detect_raspberry_pi() -> bool:
+    """Check the board model; /proc/device-tree/model is a single short string."""
+    if _SYSTEM != "Linux":
+        return False
+    for path in ("/proc/device-tree/model", "/proc/cpuinfo"):
+        try:
+            with open(path, "rb") as f:
+                if b"Raspberry Pi" in f.read(4096):
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+_IS_RPI = _detect_raspberry_pi()
+
+
+# Arm the non-blocking CPU sampler: interval=None measures against the
+# previous call, so the first real reading covers the time since import.
+psutil.cpu_percent(interval=None)
+
+
+# Fields read by validate_config, fetched in one attrgetter call. The order
+# defines the indices used in _CONFIG_RULES.
+_CONFIG_FIELDS = attrgetter(
+    "camera.resolution",
+    "camera.framerate",
+    "camera.warmup_time",
+    "detection.motion_threshold",
+    "detection.min_area",
+    "detection.blur_kernel_size",
+    "detection.delta_threshold",
+    "storage.photo_delay",
+    "storage.photo_quality",
+    "storage.max_photos",
+    "logging.level",
+)
+
+_VALID_LOG_LEVELS = frozenset(VALID_LOG_LEVELS)
+
+# (field index, predicate that holds for a valid value, error message)
+_CONFIG_RULES: Tuple[Tuple[int, Callable[[Any], bool], str], ...] = (
+    (0, lambda r: r[0] > 0 and r[1] > 0, "Camera resolution must be positive integers"),
+    (1, lambda v: v > 0, "Camera framerate must be positive"),
+    (2, lambda v: v >= 0, "Camera warmup time cannot be negative"),
+    (3, lambda v: v > 0, "Motion threshold must be positive"),
+    (4, lambda v: v > 0, "Minimum area must be positive"),
+    (5, lambda v: v > 0 and v % 2 == 1, "Blur kernel size must be positive and odd"),
+    (6, lambda v: 0 <= v <= 255, "Delta threshold must be between 0 and 255"),
+    (7, lambda v: v >= 0, "Photo delay cannot be negative"),
+    (8, lambda v: 1 <= v <= 100, "Photo quality must be between 1 and 100"),
+    (9, lambda v: v > 0, "Maximum photos must be positive"),
+    (10, lambda v: v in _VALID_LOG_LEVELS, f"Log level must be one of {list(VALID_LOG_LEVELS)}"),
+)
+
+
+def validate_config(config, fail_fast: bool = False) -> Tuple[bool, List[str]]:
+    """
+    Validate configuration settings.
 
-    if config.storage.max_photos <= 0:
-        errors.append("Maximum photos must be positive")
+    Results are memoized on a snapshot of the validated fields, so reloading
+    an unchanged config skips the checks. A config exposing a true
+    ``_dirty`` attribute is always re-checked.
 
-    # Validate logging configuration
-    valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-    if config.logging.level not in valid_log_levels:
-        errors.append(f"Log level must be one of {valid_log_levels}")
+    Args:
+        config: Configuration object to validate
+        fail_fast: Stop at the first failing check and report only that error
 
+    Returns:
+        Tuple[bool, List[str]]: (is_valid, error_messages)
+    """
+    resolution, *rest, level = _CONFIG_FIELDS(config)
+    # setup_logger upper-cases the level, so "info" is as valid as "INFO".
+    key = (tuple(resolution), *rest, str(level).upper())
+    check = (
+        _check_config_fields.__wrapped__
+        if getattr(config, "_dirty", False)
+        else _check_config_fields
+    )
+    errors = list(check(key, fail_fast))
     return len(errors) == 0, errors
 
 
-def validate_system_requirements() -> Tuple[bool, List[str]]:
+@lru_cache(maxsize=16)
+def _check_config_fields(fields: Tuple[Any, ...], fail_fast: bool = False) -> Tuple[str, ...]:
+    """Apply _CONFIG_RULES; a pure function of its arguments, hence cacheable."""
+    errors = []
+    for index, ok, message in _CONFIG_RULES:
+        if not ok(fields[index]):
+            errors.append(message)
+            if fail_fast:
+                break
+    return tuple(errors)
+
+
+@lru_cache(maxsize=8)
+def _version_tuple(version: str) -> Tuple[int, ...]:
+    """Parse "4.10.0-dev" into (4, 10, 0) so versions compare numerically."""
+    return tuple(int("".join(takewhile(str.isdigit, part)) or 0) for part in version.split(".")[:3])
+
+
+def validate_system_requirements(
+    check_cpu: bool = True,
+    check_memory: bool = True,
+    check_disk: bool = True,
+    check_opencv: bool = True,
+    check_platform: bool = True,
+) -> Tuple[bool, List[str]]:
     """
     Validate system requirements for motion detection.
 
+    Each probe can be switched off so callers that discard a warning do not
+    pay for the psutil syscalls behind it.
+
+    Args:
+        check_cpu: Warn on high CPU usage
+        check_memory: Warn on low available memory
+        check_disk: Warn on low free disk space
+        check_opencv: Warn on an outdated OpenCV build
+        check_platform: Report platform-specific hints (Raspberry Pi)
+
     Returns:
         Tuple[bool, List[str]]: (requirements_met, warning_messages)
     """
     warnings = []
 
     # Check OpenCV installation
-    try:
-        cv2_version = cv2.__version__
-        if cv2_version < "4.0.0":
-            warnings.append(f"OpenCV version {cv2_version} is outdated, recommend 4.0+")
-    except ImportError:
-        warnings.append("OpenCV not installed or not accessible")
+    if check_opencv:
+        try:
+            import cv2
+
+            cv2_version = cv2.__version__
+            if _version_tuple(cv2_version) < (4, 0, 0):
+                warnings.append(f"OpenCV version {cv2_version} is outdated, recommend 4.0+")
+        except ImportError:
+            warnings.append("OpenCV not installed or not accessible")
 
     # Check available memory
-    memory = psutil.virtual_memory()
-    if memory.available < 512 * 1024 * 1024:  # 512MB
-        warnings.append(f"Low available memory: {memory.available / (1024**2):.0f}MB")
+    if check_memory:
+        memory = _virtual_memory()
+        if memory.available < _MIN_AVAIL_BYTES:
+            warnings.append(f"Low available memory: {memory.available / _MIB:.0f}MB")
 
     # Check CPU usage
-    cpu_percent = psutil.cpu_percent(interval=1)
-    if cpu_percent > 80:
-        warnings.append(f"High CPU usage: {cpu_percent:.1f}%")
+    if check_cpu:
+        cpu_percent = _cpu_percent()
+        if cpu_percent > 80:
+            warnings.append(f"High CPU usage: {cpu_percent:.1f}%")
 
     # Check disk space
-    disk_usage = psutil.disk_usage("/")
-    free_gb = disk_usage.free / (1024**3)
-    if free_gb < 1:
-        warnings.append(f"Low disk space: {free_gb:.1f}GB available")
+    if check_disk:
+        disk_usage = _root_disk_usage()
+        if disk_usage.free < _MIN_FREE_DISK_BYTES:
+            warnings.append(f"Low disk space: {disk_usage.free / _GIB:.1f}GB available")
 
     # Platform-specific checks
-    if platform.system() == "Linux":
-        # Check for Raspberry Pi
-        try:
-            with open("/proc/cpuinfo", "r") as f:
-                cpuinfo = f.read()
-                if "Raspberry Pi" in cpuinfo:
-                    warnings.append("Running on Raspberry Pi - consider performance optimizations")
-        except OSError:
-            pass
+    if check_platform and _IS_RPI:
+        warnings.append("Running on Raspberry Pi - consider performance optimizations")
 
     return len(warnings) == 0, warnings
 
 
-def validate_camera_access(device_index: int = 0) -> Tuple[bool, str]:
+# VIDIOC_QUERYCAP fills a 104-byte struct v4l2_capability:
+# driver[16], card[32], bus_info[32], version, capabilities, device_caps,
+# reserved[3].
+_VIDIOC_QUERYCAP = 0x80685600
+_V4L2_CAPABILITY = struct.Struct("16s32s32sIII12x")
+_V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+_V4L2_CAP_VIDEO_CAPTURE_MPLANE = 0x00001000
+_V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+
+# Returned by _probe_v4l2 when /dev/video<N> does not exist at all.
+_V4L2_NO_DEVICE: Tuple[str, str, int] = ("", "", 0)
+
+
+def _probe_v4l2(device_index: int) -> Optional[Tuple[str, str, int]]:
+    """
+    Query a V4L2 node's capabilities without starting a stream.
+
+    Returns:
+        (driver, card, capabilities); _V4L2_NO_DEVICE if the node does not
+        exist, or None if it exists but cannot be queried
+    """
+    if fcntl is None or _SYSTEM != "Linux":
+        return None
+    try:
+        fd = os.open(f"/dev/video{device_index}", os.O_RDONLY | os.O_NONBLOCK)
+    except FileNotFoundError:
+        return _V4L2_NO_DEVICE
+    except OSError:
+        return None
+    try:
+        buf = fcntl.ioctl(fd, _VIDIOC_QUERYCAP, bytes(_V4L2_CAPABILITY.size))
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    driver, card, _bus, _version, caps, device_caps = _V4L2_CAPABILITY.unpack(buf)
+    if caps & _V4L2_CAP_DEVICE_CAPS:
+        caps = device_caps
+    return (
+        driver.split(b"\0", 1)[0].decode(errors="replace"),
+        card.split(b"\0", 1)[0].decode(errors="replace"),
+        caps,
+    )
+
+
+def _uses_picamera2(backend: str) -> bool:
+    """Return True if ``backend`` resolves to picamera2, as create_backend does."""
+    if backend == "picamera2":
+        return True
+    if backend != "auto":
+        return False
+    from ..core.camera_backends import picamera2_available
+
+    return picamera2_available()
+
+
+def _probe_picamera2() -> Tuple[bool, str]:
+    """List libcamera cameras through picamera2 without opening one."""
+    try:
+        from picamera2 import Picamera2
+
+        cameras = Picamera2.global_camera_info()
+    except Exception as e:
+        return False, f"picamera2 camera enumeration failed: {e}"
+    if not cameras:
+        return False, "No cameras found by picamera2"
+    return True, f"Camera accessible - {cameras[0].get('Model', 'unknown')} (picamera2)"
+
+
+def validate_camera_access(
+    device_index: int = 0, deep_probe: bool = False, backend: str = "auto"
+) -> Tuple[bool, str]:
     """
     Validate camera access and capabilities.
 
+    On Linux the device node is queried with VIDIOC_QUERYCAP, which takes
+    milliseconds; opening it through OpenCV and grabbing a frame can take
+    seconds. OpenCV is used when ``deep_probe`` is set or V4L2 is unavailable.
+
+    With the picamera2 backend a V4L2 node answering QUERYCAP says nothing
+    about the camera module, so cameras are enumerated through picamera2.
+
     Args:
         device_index: Camera device index
+        deep_probe: Open the camera with OpenCV and capture a test frame
+        backend: Configured capture backend ("auto", "opencv", "picamera2")
 
     Returns:
         Tuple[bool, str]: (camera_accessible, message)
     """
+    if _uses_picamera2(backend):
+        return _probe_picamera2()
+
+    if not deep_probe:
+        info = _probe_v4l2(device_index)
+        if info is _V4L2_NO_DEVICE:
+            # No node, so OpenCV cannot open it either; skip its slow probe.
+            return False, f"Camera device {device_index} not accessible"
+        if info is not None:
+            driver, card, caps = info
+            if not caps & (_V4L2_CAP_VIDEO_CAPTURE | _V4L2_CAP_VIDEO_CAPTURE_MPLANE):
+                return False, f"Camera device {device_index} does not support video capture"
+            return True, f"Camera accessible - {card} ({driver})"
+
     try:
+        import cv2
+
         camera = cv2.VideoCapture(device_index)
 
         if not camera.isOpened():
             return False, f"Camera device {device_index} not accessible"
 
-        # Test frame capture
-        ret, frame = camera.read()
-        if not ret or frame is None:
+        # Test frame capture; grab() skips decoding the frame into an array
+        if not camera.grab():
             camera.release()
             return False, f"Camera device {device_index} cannot capture frames"
 
@@ -147,10 +373,35 @@ def validate_camera_access(device_index: int = 0) -> Tuple[bool, str]:
         return False, f"Camera validation failed: {str(e)}"
 
 
+# Directories that passed validate_directory_permissions, keyed by path, with
+# the stat fields that decide access. mtime is deliberately not used: every
+# photo saved into the directory changes it.
+_DIR_CACHE: Dict[str, Tuple[int, int, int, int, int]] = {}
+
+
+def _permission_stamp(directory: str) -> Optional[Tuple[int, int, int, int, int]]:
+    try:
+        st = os.stat(directory)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino, st.st_mode, st.st_uid, st.st_gid)
+
+
+def _access_is_reliable() -> bool:
+    """os.access is authoritative except for root (bypasses mode bits) and Windows ACLs."""
+    if sys.platform == "win32":
+        return False
+    return os.geteuid() != 0
+
+
 def validate_directory_permissions(directory: str) -> Tuple[bool, str]:
     """
     Validate directory permissions for read/write operations.
 
+    Permissions are checked with os.access; a test file is only written
+    where access() cannot be trusted. A directory that passed is not
+    re-probed until its identity, mode or ownership changes.
+
     Args:
         directory: Directory path to validate
 
@@ -158,18 +409,36 @@ def validate_directory_permissions(directory: str) -> Tuple[bool, str]:
         Tuple[bool, str]: (permissions_ok, message)
     """
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(directory, exist_ok=True)
-
-        # Test write permission
-        test_file = os.path.join(directory, ".permission_test")
-        try:
-            with open(test_file, "w") as f:
-                f.write("test")
-            os.remove(test_file)
-            return True, f"Directory {directory} is writable"
-        except PermissionError:
-            return False, f"No write permission for directory {directory}"
+        stamp = _permission_stamp(directory)
+        if stamp is None or _DIR_CACHE.get(directory) != stamp:
+            # Create directory if it doesn't exist
+            os.makedirs(directory, exist_ok=True)
+
+            if not os.path.isdir(directory):
+                return False, f"{directory} is not a directory"
+
+            if not os.access(directory, os.R_OK | os.W_OK | os.X_OK):
+                return False, f"No write permission for directory {directory}"
+
+            if not _access_is_reliable():
+                test_file = os.path.join(directory, ".permission_test")
+                try:
+                    with open(test_file, "w") as f:
+                        f.write("test")
+                    os.remove(test_file)
+                except PermissionError:
+                    return False, f"No write permission for directory {directory}"
+
+            # Only successes are remembered; a failing directory is re-probed.
+            stamp = _permission_stamp(directory)
+            if stamp is not None:
+                _DIR_CACHE[directory] = stamp
+
+        if hasattr(os, "statvfs"):
+            st = os.statvfs(directory)
+            free_gb = st.f_bavail * st.f_frsize / _GIB
+            return True, f"Directory {directory} is writable ({free_gb:.1f}GB free)"
+        return True, f"Directory {directory} is writable"
 
     except Exception as e:
         return False, f"Directory validation failed: {str(e)}"
@@ -192,13 +461,24 @@ def validate_network_connectivity(
     import socket
 
     try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True, "Network connectivity available"
-    except socket.error:
+        # Per-connection timeout; the socket is closed on every path.
+        with socket.create_connection((host, port), timeout=timeout):
+            return True, "Network connectivity available"
+    except OSError:
         return False, "No network connectivity"
 
 
+_VGA_PIXELS = 640 * 480
+
+_PERFORMANCE_MESSAGES = (
+    "High processing load - consider reducing resolution or framerate",
+    "Low CPU count - consider reducing framerate for better performance",
+    "Low memory - consider reducing resolution",
+    "ARM processor detected - consider lower resolution for better performance",
+    "ARM processor detected - consider lower framerate",
+)
+
+
 def validate_performance_requirements(
     resolution: Tuple[int, int], framerate: int
 ) -> Tuple[bool, List[str]]:
@@ -212,103 +492,221 @@ def validate_performance_requirements(
     Returns:
         Tuple[bool, List[str]]: (requirements_met, recommendations)
     """
-    recommendations = []
-
-    # Calculate approximate processing load
-    pixels_per_second = resolution[0] * resolution[1] * framerate
-
-    # Get system specs
-    cpu_count = psutil.cpu_count()
-    memory_gb = psutil.virtual_memory().total / (1024**3)
-
-    # Performance recommendations
-    if pixels_per_second > 30_000_000:  # 30M pixels/second
-        recommendations.append("High processing load - consider reducing resolution or framerate")
-
-    if cpu_count < 4 and framerate > 15:
-        recommendations.append("Low CPU count - consider reducing framerate for better performance")
+    pixels = resolution[0] * resolution[1]
+    large_frame = pixels > _VGA_PIXELS
+    high_framerate = framerate > 15
+
+    # One flag per _PERFORMANCE_MESSAGES entry; system specs are only
+    # sampled when the cheaper condition beside them already holds.
+    triggered = (
+        pixels * framerate > 30_000_000,  # 30M pixels/second
+        high_framerate and _cpu_count() < 4,
+        large_frame and _virtual_memory().total < _GIB,
+        _IS_ARM and large_frame,  # Likely Raspberry Pi
+        _IS_ARM and high_framerate,
+    )
+    recommendations = [msg for hit, msg in zip(triggered, _PERFORMANCE_MESSAGES) if hit]
 
-    if memory_gb < 1 and resolution[0] * resolution[1] > 640 * 480:
-        recommendations.append("Low memory - consider reducing resolution")
+    return len(recommendations) == 0, recommendations
 
-    # Platform-specific recommendations
-    if platform.machine().startswith("arm"):  # Likely Raspberry Pi
-        if resolution[0] * resolution[1] > 640 * 480:
-            recommendations.append(
-                "ARM processor detected - consider lower resolution for better performance"
-            )
-        if framerate > 15:
-            recommendations.append("ARM processor detected - consider lower framerate")
 
-    return len(recommendations) == 0, recommendations
+@dataclass(slots=True)
+class Diagnostics:
+    """Result of run_system_diagnostics."""
+
+    platform: str
+    machine: str
+    python_version: str
+    cpu_count: int
+    memory_gb: float
+    opencv_available: bool = False
+    opencv_version: str = ""
+    camera_accessible: bool = False
+    camera_message: str = ""
+    disk_space_ok: bool = False
+    disk_free_gb: float = 0.0
+    memory_ok: bool = False
+    memory_available_mb: float = 0.0
+    performance_ok: bool = False
+    system_ready: bool = False
+
+    def to_dict(self) -> dict:
+        """Diagnostics in the nested dict form, with host facts under system_info."""
+        return {
+            "system_info": {
+                "platform": self.platform,
+                "machine": self.machine,
+                "python_version": self.python_version,
+                "cpu_count": self.cpu_count,
+                "memory_gb": self.memory_gb,
+            },
+            "opencv_available": self.opencv_available,
+            "opencv_version": self.opencv_version,
+            "camera_accessible": self.camera_accessible,
+            "camera_message": self.camera_message,
+            "disk_space_ok": self.disk_space_ok,
+            "disk_free_gb": self.disk_free_gb,
+            "memory_ok": self.memory_ok,
+            "memory_available_mb": self.memory_available_mb,
+            "performance_ok": self.performance_ok,
+            "system_ready": self.system_ready,
+        }
+
+
+def _probe_camera_into(
+    results: "queue.Queue[Tuple[bool, str]]", probe: Callable[[], Tuple[bool, str]]
+) -> None:
+    """Run ``probe`` on a worker thread and hand its result back."""
+    try:
+        results.put(probe())
+    except Exception as e:
+        results.put((False, f"Camera validation failed: {e}"))
 
 
-def run_system_diagnostics(logger: Optional[logging.Logger] = None) -> dict:
+def run_system_diagnostics(
+    logger: Optional[logging.Logger] = None,
+    cached_camera_probe: bool = False,
+    parallel: bool = True,
+    camera_timeout: float = CAMERA_PROBE_TIMEOUT,
+    camera_backend: str = "auto",
+) -> Diagnostics:
     """
     Run comprehensive system diagnostics.
 
+    The camera probe, the slowest check, runs on a worker thread while the
+    OpenCV and system checks proceed.
+
     Args:
         logger: Logger instance for output
+        cached_camera_probe: Reuse the camera probe result from an earlier
+            call in this process instead of opening the camera again
+        parallel: Overlap the camera probe with the other checks; pass
+            False to run everything on the calling thread
+        camera_timeout: Seconds to wait for the camera probe before
+            reporting the camera as inaccessible
+        camera_backend: Configured capture backend, passed to the probe
 
     Returns:
-        dict: Diagnostic results
+        Diagnostics: Diagnostic results
     """
+    global _camera_probe_result
+
     if logger is None:
         logger = logging.getLogger(__name__)
 
-    results = {
-        "system_info": {
-            "platform": platform.system(),
-            "machine": platform.machine(),
-            "python_version": platform.python_version(),
-            "cpu_count": psutil.cpu_count(),
-            "memory_gb": psutil.virtual_memory().total / (1024**3),
-        },
-        "opencv_available": False,
-        "camera_accessible": False,
-        "disk_space_ok": False,
-        "memory_ok": False,
-        "performance_ok": False,
-    }
+    # A daemon thread, not an executor: concurrent.futures joins its workers
+    # at interpreter exit, so a hung camera driver would stall shutdown.
+    camera_queue: Optional[queue.Queue] = None
+    if not (cached_camera_probe and _camera_probe_result is not None) and parallel:
+        camera_queue = queue.Queue(maxsize=1)
+        threading.Thread(
+            target=_probe_camera_into,
+            args=(camera_queue, partial(validate_camera_access, backend=camera_backend)),
+            name="CameraProbe",
+            daemon=True,
+        ).start()
+
+    # One memory snapshot serves both the system info and the memory check.
+    memory = _virtual_memory()
+    disk_usage = _root_disk_usage()
+
+    results = Diagnostics(
+        platform=_SYSTEM,
+        machine=_MACHINE,
+        python_version=_PYVER,
+        cpu_count=_cpu_count(),
+        memory_gb=memory.total / _GIB,
+    )
 
     # Test OpenCV
     try:
         import cv2
 
-        results["opencv_available"] = True
-        results["opencv_version"] = cv2.__version__
-        logger.info(f"OpenCV {cv2.__version__} available")
+        results.opencv_available = True
+        results.opencv_version = cv2.__version__
     except ImportError:
         logger.error("OpenCV not available")
 
     # Test camera
-    camera_ok, camera_msg = validate_camera_access()
-    results["camera_accessible"] = camera_ok
-    results["camera_message"] = camera_msg
-    logger.info(camera_msg)
+    if camera_queue is not None:
+        try:
+            camera_ok, camera_msg = camera_queue.get(timeout=camera_timeout)
+            _camera_probe_result = (camera_ok, camera_msg)
+        except queue.Empty:
+            # The stuck probe thread is a daemon and is left to finish alone.
+            camera_ok, camera_msg = False, f"Camera probe timed out after {camera_timeout:g}s"
+    elif cached_camera_probe and _camera_probe_result is not None:
+        camera_ok, camera_msg = _camera_probe_result
+    else:
+        camera_ok, camera_msg = validate_camera_access(backend=camera_backend)
+        _camera_probe_result = (camera_ok, camera_msg)
+    results.camera_accessible = camera_ok
+    results.camera_message = camera_msg
 
     # Test disk space
-    disk_usage = psutil.disk_usage("/")
-    free_gb = disk_usage.free / (1024**3)
-    results["disk_space_ok"] = free_gb > 1
-    results["disk_free_gb"] = free_gb
-    logger.info(f"Disk space: {free_gb:.1f}GB available")
+    free_gb = disk_usage.free / _GIB
+    results.disk_space_ok = disk_usage.free >= _MIN_FREE_DISK_BYTES
+    results.disk_free_gb = free_gb
 
     # Test memory
-    memory = psutil.virtual_memory()
-    available_mb = memory.available / (1024**2)
-    results["memory_ok"] = available_mb > 512
-    results["memory_available_mb"] = available_mb
-    logger.info(f"Memory: {available_mb:.0f}MB available")
+    available_mb = memory.available / _MIB
+    results.memory_ok = memory.available >= _MIN_AVAIL_BYTES
+    results.memory_available_mb = available_mb
+
+    # One record for the whole report instead of a record per line.
+    if logger.isEnabledFor(logging.INFO):
+        lines = []
+        if results.opencv_available:
+            lines.append(f"OpenCV {results.opencv_version} available")
+        lines.append(camera_msg)
+        lines.append(f"Disk space: {free_gb:.1f}GB available")
+        lines.append(f"Memory: {available_mb:.0f}MB available")
+        logger.info("\n".join(lines))
 
     # Overall system health
-    results["system_ready"] = all(
-        [
-            results["opencv_available"],
-            results["camera_accessible"],
-            results["disk_space_ok"],
-            results["memory_ok"],
-        ]
+    results.system_ready = (
+        results.opencv_available
+        and results.camera_accessible
+        and results.disk_space_ok
+        and results.memory_ok
     )
 
     return results
+
+
+def validate_all(
+    config, logger: Optional[logging.Logger] = None, cached_camera_probe: bool = False
+) -> dict:
+    """
+    Run config, system, performance and diagnostic checks in one call.
+
+    The checks share a single memory, disk and CPU sample through the sample
+    cache, so the combined run costs no more syscalls than any one of them.
+
+    Args:
+        config: Configuration object to validate
+        logger: Logger instance for diagnostics output
+        cached_camera_probe: Reuse an earlier camera probe result
+
+    Returns:
+        dict: Diagnostics.to_dict() plus config errors, system warnings and
+        performance recommendations
+    """
+    config_ok, config_errors = validate_config(config)
+    system_ok, system_warnings = validate_system_requirements()
+    performance_ok, recommendations = validate_performance_requirements(
+        tuple(config.camera.resolution), config.camera.framerate
+    )
+
+    results = run_system_diagnostics(
+        logger, cached_camera_probe=cached_camera_probe, camera_backend=config.camera.backend
+    ).to_dict()
+    results.update(
+        config_valid=config_ok,
+        config_errors=config_errors,
+        system_requirements_met=system_ok,
+        system_warnings=system_warnings,
+        performance_ok=performance_ok,
+        recommendations=recommendations,
+    )
+    return results
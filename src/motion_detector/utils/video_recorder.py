@@ -18,6 +18,10 @@ import numpy as np
 
 FrameSource = Callable[[], Optional[np.ndarray]]
 
+# MJPG in an AVI container is broadly supported, including on headless OpenCV
+# builds without ffmpeg.
+_FOURCC = {"mp4": cv2.VideoWriter_fourcc(*"mp4v"), "avi": cv2.VideoWriter_fourcc(*"MJPG")}
+
 
 class VideoRecorder:
     """Write fixed-duration clips via ``cv2.VideoWriter``."""
@@ -44,11 +48,7 @@ class VideoRecorder:
         return self._recording.is_set()
 
     def _fourcc(self) -> int:
-        if self.video_format == "mp4":
-            return cv2.VideoWriter_fourcc(*"mp4v")
-        # MJPG in an AVI container is broadly supported, including on headless
-        # OpenCV builds without ffmpeg.
-        return cv2.VideoWriter_fourcc(*"MJPG")
+        return _FOURCC.get(self.video_format, _FOURCC["avi"])
 
     def record(
         self, frame_source: FrameSource, duration: float, filename: str
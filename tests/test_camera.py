@@ -0,0 +1,253 @@
+"""Tests for the threaded CameraManager capture path."""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from motion_detector.config.defaults import create_default_config
+from motion_detector.core.camera import CameraManager
+from motion_detector.core.camera_backends import CaptureBackend
+
+
+class FakeBackend(CaptureBackend):
+    """Backend producing numbered frames and counting grabs/retrieves."""
+
+    name = "fake"
+
+    def __init__(self, config, logger=None):
+        super().__init__(config, logger)
+        self.grabs = 0
+        self.retrieves = 0
+
+    def open(self):
+        pass
+
+    def is_opened(self):
+        return True
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+    def grab(self):
+        time.sleep(0.001)
+        self.grabs += 1
+        return True
+
+    def retrieve(self, dst=None):
+        self.retrieves += 1
+        if dst is None:
+            dst = np.empty((4, 6, 3), dtype=np.uint8)
+        dst[:] = self.grabs % 256
+        return True, dst
+
+    def describe(self):
+        return {"resolution": (6, 4), "fps": 30.0, "backend": self.name}
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def manager():
+    cam = CameraManager(create_default_config()["camera"])
+    cam.backend = FakeBackend(cam.config)
+    cam.is_initialized = True
+    yield cam
+    cam.stop_streaming()
+
+
+def _wait_for(predicate, timeout=1.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_capture_loop_only_retrieves_when_a_frame_is_wanted(manager):
+    backend = manager.backend
+    assert manager.start_streaming()
+    assert _wait_for(lambda: backend.grabs > 20)
+
+    # Nobody asked for frames after the first one, so none were decoded.
+    assert backend.retrieves == 1
+
+    assert manager.get_frame() is not None
+    assert _wait_for(lambda: backend.retrieves == 2)
+
+
+def test_frames_are_retrieved_into_a_reused_ring(manager):
+    assert manager.start_streaming()
+    seen = set()
+    for _ in range(10):
+        assert _wait_for(lambda: manager.latest_frame is not None)
+        frame = manager.get_frame(copy=False)
+        seen.add(id(frame))
+        time.sleep(0.01)
+
+    assert len(seen) <= CameraManager.FRAME_RING_SIZE
+
+    # The default still hands out a private copy.
+    copied = manager.get_frame()
+    assert copied is not manager.latest_frame
+
+
+def test_drain_stops_at_first_fresh_frame(manager):
+    backend = manager.backend
+    queued = [0.0, 0.0, 0.05]  # two buffered frames, then a live one
+
+    def grab():
+        time.sleep(queued.pop(0) if queued else 0.05)
+        backend.grabs += 1
+        return True
+
+    backend.grab = grab
+    assert manager._drain_stale_frames(0) == 3
+    assert not queued
+
+
+def test_drain_is_bounded(manager):
+    manager.backend.grab = lambda: True  # every grab looks buffered
+    assert manager._drain_stale_frames(0) == manager.max_stale_grabs
+
+
+def test_drain_skipped_after_a_slow_grab(manager):
+    assert manager._drain_stale_frames(1_000_000_000) == 0
+
+
+def test_get_frame_waits_for_a_new_frame(manager):
+    assert manager.start_streaming()
+    first = manager.get_frame()
+    second = manager.get_frame()
+    assert first is not None and second is not None
+    assert manager._delivered_seq >= 2
+
+
+def test_get_frame_times_out_without_new_frames(manager):
+    manager.is_streaming = True  # no capture thread publishes anything
+    manager._frame_wait_timeout = 0.01
+    assert manager.get_frame() is None
+
+
+def test_pin_capture_thread_is_optional(manager, monkeypatch):
+    import os
+
+    calls = []
+    monkeypatch.setattr(
+        os, "sched_setaffinity", lambda pid, cpus: calls.append(cpus), raising=False
+    )
+
+    manager._pin_capture_thread()
+    assert calls == []
+
+    manager.capture_cpu = 0
+    manager._pin_capture_thread()
+    assert calls == [{0}]
+
+
+def test_camera_info_is_cached_at_initialize(monkeypatch):
+    from motion_detector.core import camera as camera_mod
+
+    config = create_default_config()["camera"]
+    config.warmup_time = 0
+    backend = FakeBackend(config)
+    calls = []
+    real_describe = backend.describe
+    backend.describe = lambda: calls.append(1) or real_describe()
+    monkeypatch.setattr(camera_mod, "create_backend", lambda cfg, logger=None: backend)
+
+    cam = CameraManager(config)
+    assert cam.initialize()
+    for _ in range(3):
+        assert cam.get_camera_info()["resolution"] == (6, 4)
+    assert len(calls) == 1
+
+
+def test_frame_pair_includes_downscaled_copy(manager):
+    manager.backend = FakeBackend(manager.config)
+    manager.backend.retrieve = lambda dst=None: (True, np.zeros((40, 60, 3), np.uint8))
+    manager.detect_scale = 0.5
+    assert manager.start_streaming()
+
+    frame, small = manager.get_frame_pair()
+    assert frame.shape == (40, 60, 3)
+    assert small.shape == (20, 30, 3)
+
+
+def test_capture_statistics_summarize_recent_frames(manager):
+    assert manager.get_capture_statistics() == {}
+    manager._capture_times_ns.extend(ms * 1_000_000 for ms in range(1, 101))
+
+    stats = manager.get_capture_statistics()
+    assert stats["samples"] == 100
+    assert stats["mean_ms"] == pytest.approx(50.5)
+    assert stats["p95_ms"] == pytest.approx(95.0)
+
+
+def test_peek_frame_leaves_borrowed_frame_intact(manager):
+    assert manager.start_streaming()
+    stop = threading.Event()
+
+    def recorder():
+        while not stop.is_set():
+            manager.peek_frame()
+            time.sleep(0.001)
+
+    reader = threading.Thread(target=recorder)
+    reader.start()
+    try:
+        for _ in range(5):
+            frame = manager.get_frame(copy=False)
+            assert frame is not None
+            value = int(frame[0, 0, 0])
+            time.sleep(0.05)  # detection, saving and publishing on the borrowed frame
+            assert int(frame[0, 0, 0]) == value
+    finally:
+        stop.set()
+        reader.join()
+
+
+def test_peek_frame_does_not_take_frames_from_the_consumer(manager):
+    assert manager.start_streaming()
+    assert manager.get_frame(copy=False) is not None
+    stop = threading.Event()
+
+    def recorder():
+        while not stop.is_set():
+            manager.peek_frame()
+
+    reader = threading.Thread(target=recorder)
+    reader.start()
+    try:
+        for _ in range(20):
+            delivered = manager._delivered_seq
+            assert manager.get_frame(copy=False) is not None
+            assert manager._delivered_seq > delivered
+    finally:
+        stop.set()
+        reader.join()
+
+
+def test_rearm_right_after_publish_is_not_lost(manager):
+    backend = manager.backend
+    retrieve_into_ring = manager._retrieve_into_ring
+
+    def slow_return():
+        # Hold the capture thread between publishing and returning, so the
+        # consumer re-arms inside that window.
+        published = retrieve_into_ring()
+        time.sleep(0.05)
+        return published
+
+    manager._retrieve_into_ring = slow_return
+    assert manager.start_streaming()
+    assert manager.get_frame(copy=False) is not None
+    retrieved = backend.retrieves
+
+    # get_frame re-armed on return; the next frame is prefetched without
+    # the consumer asking again.
+    assert _wait_for(lambda: backend.retrieves > retrieved, timeout=0.5)
@@ -1,10 +1,14 @@
 """Tests for camera backend selection and behavior."""
 
+import cv2
+import numpy as np
 import pytest
 
 from motion_detector.config.defaults import create_default_config
 from motion_detector.core import camera_backends
 from motion_detector.core.camera_backends import (
+    FOURCC_MJPG,
+    FOURCC_YUYV,
     CaptureBackend,
     OpenCVBackend,
     PiCamera2Backend,
@@ -63,3 +67,68 @@ def test_picamera2_open_raises_helpful_error_when_missing(camera_config):
     backend = PiCamera2Backend(camera_config)
     with pytest.raises(RuntimeError, match="picamera2"):
         backend.open()
+
+
+class _ReadOnlyBackend(CaptureBackend):
+    name = "fake"
+
+    def open(self):
+        pass
+
+    def is_opened(self):
+        return True
+
+    def read(self):
+        return True, np.full((4, 6, 3), 7, dtype=np.uint8)
+
+    def describe(self):
+        return {}
+
+    def release(self):
+        pass
+
+
+def test_default_grab_retrieve_falls_back_to_read(camera_config):
+    backend = _ReadOnlyBackend(camera_config)
+    assert backend.grab() is True
+
+    dst = np.zeros((4, 6, 3), dtype=np.uint8)
+    ret, frame = backend.retrieve(dst)
+    assert ret is True
+    assert frame is dst
+    assert int(dst[0, 0, 0]) == 7
+
+
+class _FakeCapture:
+    """Stand-in for cv2.VideoCapture that caps YUYV at a given fps."""
+
+    def __init__(self, yuyv_fps):
+        self.yuyv_fps = yuyv_fps
+        self.props = {}
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS and self.props.get(cv2.CAP_PROP_FOURCC) == FOURCC_YUYV:
+            return min(self.yuyv_fps, self.props.get(prop, 0))
+        return self.props.get(prop, 0)
+
+
+@pytest.mark.parametrize("yuyv_fps, expected", [(30, "YUYV"), (10, "MJPG")])
+def test_auto_pixel_format_prefers_yuyv_at_full_rate(camera_config, yuyv_fps, expected):
+    backend = OpenCVBackend(camera_config)
+    backend._capture = _FakeCapture(yuyv_fps)
+    backend._configure()
+
+    assert backend._capture.props[cv2.CAP_PROP_FOURCC] == cv2.VideoWriter_fourcc(*expected)
+    assert backend._capture.props[cv2.CAP_PROP_FPS] == camera_config.framerate
+
+
+def test_explicit_pixel_format_is_used(camera_config):
+    camera_config.pixel_format = "MJPG"
+    backend = OpenCVBackend(camera_config)
+    backend._capture = _FakeCapture(30)
+    backend._configure()
+    assert backend._capture.props[cv2.CAP_PROP_FOURCC] == FOURCC_MJPG
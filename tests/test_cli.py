@@ -0,0 +1,60 @@
+"""Tests for the command line interface."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from motion_detector import cli
+from motion_detector.cli import create_argument_parser
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+
+
+def test_parser_accepts_runtime_flags():
+    args = create_argument_parser().parse_args(["--config", "x.json", "--debug", "--no-preview"])
+    assert args.config == "x.json"
+    assert args.debug is True
+    assert args.no_preview is True
+
+
+def test_version_exits_cleanly(capsys):
+    with pytest.raises(SystemExit) as exc:
+        create_argument_parser().parse_args(["--version"])
+    assert exc.value.code == 0
+    assert "motion-detector" in capsys.readouterr().out
+
+
+def test_importing_cli_does_not_load_opencv():
+    code = "import sys, motion_detector.cli; print('cv2' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_run_diagnostics_writes_report_in_blocks(monkeypatch, capsys):
+    from motion_detector.utils import validators
+
+    monkeypatch.setattr(
+        validators,
+        "run_system_diagnostics",
+        lambda logger=None: validators.Diagnostics(
+            platform="Linux",
+            machine="aarch64",
+            python_version="3.11.2",
+            cpu_count=4,
+            memory_gb=4.0,
+            system_ready=True,
+        ),
+    )
+    writes = []
+    real_write = sys.stdout.write
+    monkeypatch.setattr(sys.stdout, "write", lambda text: writes.append(text) or real_write(text))
+
+    assert cli.run_diagnostics() is True
+    # Header block plus one report block.
+    assert len(writes) == 2
+    assert "Platform: Linux" in capsys.readouterr().out
@@ -2,6 +2,9 @@
 
 import json
 
+import pytest
+
+from motion_detector.config import settings as settings_mod
 from motion_detector.config.defaults import create_default_config
 from motion_detector.config.settings import Settings
 
@@ -67,6 +70,28 @@ def test_validate_rejects_bad_photo_quality(tmp_path):
     assert settings.validate() is False
 
 
+def test_validate_rejects_zero_background_update_interval(tmp_path):
+    settings = Settings(str(tmp_path / "missing.json"))
+    settings.detection.background_update_interval = 0
+    assert settings.validate() is False
+
+
+def test_validate_rejects_unknown_blur_method(tmp_path):
+    settings = Settings(str(tmp_path / "missing.json"))
+    settings.detection.blur_method = "median"
+    assert settings.validate() is False
+
+
+def test_validate_normalizes_log_level_case(tmp_path):
+    settings = Settings(str(tmp_path / "missing.json"))
+    settings.logging.level = "debug"
+    assert settings.validate() is True
+    assert settings.logging.level == "DEBUG"
+
+    settings.logging.level = "verbose"
+    assert settings.validate() is False
+
+
 def test_save_and_reload_roundtrip(tmp_path):
     config_file = tmp_path / "settings.json"
     settings = Settings(str(config_file))
@@ -75,3 +100,73 @@ def test_save_and_reload_roundtrip(tmp_path):
 
     reloaded = Settings(str(config_file))
     assert reloaded.camera.framerate == 12
+
+
+def test_freeze_snapshots_hot_settings(tmp_path):
+    settings = Settings(str(tmp_path / "missing.json"))
+    settings.display.show_preview = False
+    settings.storage.photo_delay = 4.0
+
+    hot = settings.freeze()
+    assert hot.show_preview is False
+    assert hot.photo_delay == 4.0
+
+    # The snapshot is immutable and does not track later changes.
+    settings.storage.photo_delay = 7.0
+    assert hot.photo_delay == 4.0
+    assert settings.freeze().photo_delay == 7.0
+
+
+def test_load_config_reuses_cached_parse(tmp_path, monkeypatch):
+    config_file = tmp_path / "settings.json"
+    config_file.write_text(json.dumps({"detection": {"regions": [[0, 0, 10, 10]]}}))
+    Settings.clear_cache()
+
+    calls = []
+    real_loads = settings_mod._json_loads
+    monkeypatch.setattr(
+        settings_mod, "_json_loads", lambda data: calls.append(1) or real_loads(data)
+    )
+
+    first = Settings(str(config_file))
+    second = Settings(str(config_file))
+
+    assert len(calls) == 1
+    # Cached values are copied, never shared between instances.
+    first.detection.regions.append([1, 1, 1, 1])
+    assert second.detection.regions == [[0, 0, 10, 10]]
+
+
+def test_save_config_invalidates_cache(tmp_path):
+    config_file = tmp_path / "settings.json"
+    settings = Settings(str(config_file))
+    settings.camera.framerate = 12
+    settings.save_config()
+    assert Settings(str(config_file)).camera.framerate == 12
+
+    settings.camera.framerate = 24
+    settings.save_config()
+    assert Settings(str(config_file)).camera.framerate == 24
+
+
+def test_update_from_dict_ignores_unknown_keys(tmp_path):
+    settings = Settings(str(tmp_path / "missing.json"))
+    settings._update_from_dict({"camera": {"framerate": 9, "bogus": 1}})
+
+    assert settings.camera.framerate == 9
+    assert not hasattr(settings.camera, "bogus")
+    assert "bogus" not in settings._to_dict()["camera"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_saved_config_is_plain_indented_json(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(settings_mod, "orjson", None)
+    elif settings_mod.orjson is None:
+        pytest.skip("orjson not installed")
+    config_file = tmp_path / "settings.json"
+    Settings(str(config_file)).save_config()
+
+    data = json.loads(config_file.read_text())
+    assert data["camera"]["resolution"] == [640, 480]
+    assert config_file.read_text().startswith('{\n  "camera"')
@@ -0,0 +1,168 @@
+"""Tests for MotionDetector orchestration that run without a camera."""
+
+import json
+import logging
+import time
+
+import cv2
+
+import numpy as np
+import pytest
+
+from motion_detector.core.detector import MotionDetector
+from motion_detector.utils.file_manager import FileManager
+
+
+@pytest.fixture
+def detector(tmp_path, monkeypatch):
+    monkeypatch.setattr(MotionDetector, "_setup_signal_handlers", lambda self: None)
+    config_file = tmp_path / "settings.json"
+    config_file.write_text(json.dumps({"logging": {"log_to_file": False}}))
+
+    det = MotionDetector(config_file=str(config_file))
+    det.file_manager = FileManager(str(tmp_path / "images"), det.logger)
+    det.settings.storage.photo_delay = 0.0
+    det._hot = det.settings.freeze()
+    return det
+
+
+def _frame():
+    return np.full((60, 80, 3), 128, dtype=np.uint8)
+
+
+def test_motion_photo_saved_synchronously_without_writer(detector):
+    detector._handle_motion_detected(_frame(), [], total_area=1500.0)
+    assert detector.file_manager.get_file_statistics()["total_files"] == 1
+
+
+def test_motion_photo_saved_by_writer_thread(detector):
+    detector._start_writer()
+    frame = _frame()
+    detector._handle_motion_detected(frame, [], total_area=1500.0)
+    # The queued frame is a private copy, so the caller may reuse its buffer.
+    frame[:] = 0
+    detector._stop_writer()
+
+    assert detector._writer_thread is None
+    assert detector.file_manager.get_file_statistics()["total_files"] == 1
+    assert detector.motion_logger.get_statistics()["total_photos"] == 1
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+@pytest.fixture
+def preview(detector, monkeypatch):
+    """Detector wired for preview rendering with HighGUI stubbed out."""
+    from motion_detector.core.camera import CameraManager
+    from motion_detector.core.processor import ImageProcessor
+
+    shown = []
+    keys = []
+    monkeypatch.setattr(cv2, "imshow", lambda name, image: shown.append(image.copy()))
+    monkeypatch.setattr(cv2, "waitKey", lambda delay: keys.pop(0) if keys else -1)
+    monkeypatch.setattr(cv2, "destroyAllWindows", lambda: None)
+    detector.image_processor = ImageProcessor(detector.settings.detection)
+    detector.camera_manager = CameraManager(detector.settings.camera)
+    detector.settings.display.preview_fps = 100
+    detector.settings.display.preview_scale = 0.5
+    detector._hot = detector.settings.freeze()
+    yield detector, shown, keys
+    detector._stop_preview()
+
+
+def test_preview_thread_renders_published_frames(preview):
+    detector, shown, _ = preview
+    detector._start_preview()
+
+    frame = _frame()
+    detector._publish_preview(frame, [], False)
+    assert _wait_for(lambda: len(shown) == 1)
+
+    # Nothing new published, nothing new shown; the source frame is untouched.
+    time.sleep(0.05)
+    assert len(shown) == 1
+    assert shown[0].shape == (30, 40, 3)
+    assert int(frame[0, 0, 0]) == 128
+
+
+def test_preview_keys_become_events(preview):
+    detector, shown, keys = preview
+    keys.extend([ord("r"), ord("s"), ord("q")])
+    detector._start_preview()
+
+    for _ in range(3):
+        count = len(shown)
+        detector._publish_preview(_frame(), [], False)
+        assert _wait_for(lambda: len(shown) > count)
+
+    assert detector._reset_background_event.is_set()
+    assert detector._manual_capture_event.is_set()
+    assert _wait_for(lambda: not detector._preview_thread.is_alive())
+
+
+def test_signal_handler_only_sets_stop_event(tmp_path):
+    import signal
+
+    config_file = tmp_path / "settings.json"
+    config_file.write_text(json.dumps({"logging": {"log_to_file": False}}))
+    previous = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        det = MotionDetector(config_file=str(config_file))
+        handler = signal.getsignal(signal.SIGTERM)
+        handler(signal.SIGTERM, None)  # must not raise SystemExit
+        assert det.stop_event.is_set()
+    finally:
+        for sig, old in previous.items():
+            signal.signal(sig, old)
+
+
+def test_cleanup_thread_runs_on_interval_until_stopped(detector, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        detector.file_manager,
+        "cleanup_old_files",
+        lambda max_files, max_age_days=None: calls.append(max_files),
+    )
+    detector.settings.storage.cleanup_interval = 0.01
+    detector._start_cleanup()
+    assert _wait_for(lambda: len(calls) >= 2)
+
+    detector.stop_event.set()
+    detector._stop_cleanup()
+    assert detector._cleanup_thread is None
+    assert calls[0] == detector.settings.storage.max_photos
+
+
+def test_performance_stats_skipped_when_info_disabled(detector):
+    touched = []
+
+    class Recorder:
+        def __getattr__(self, name):
+            touched.append(name)
+            raise AttributeError(name)
+
+    detector.image_processor = Recorder()
+    detector.camera_manager = Recorder()
+    detector.logger.setLevel(logging.WARNING)
+    detector._log_performance_stats()
+    assert touched == []
+
+
+@pytest.mark.parametrize(
+    "is_arm, configured, expected",
+    [(False, 0, []), (False, 2, [2]), (True, 3, [3])],
+)
+def test_configure_opencv_threads(detector, monkeypatch, is_arm, configured, expected):
+    calls = []
+    monkeypatch.setattr("motion_detector.core.detector.IS_ARM", is_arm)
+    monkeypatch.setattr(cv2, "setNumThreads", calls.append)
+    detector.settings.system.opencv_threads = configured
+    detector._configure_opencv()
+    assert calls == expected
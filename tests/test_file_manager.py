@@ -1,5 +1,8 @@
 """Tests for the FileManager utility."""
 
+import os
+import time
+
 import cv2
 import numpy as np
 import pytest
@@ -23,6 +26,27 @@ def test_generate_filename_format(manager):
     assert name.endswith(".jpg")
 
 
+def test_generate_filename_matches_strftime_layout(manager, monkeypatch):
+    # 2024-01-02 03:04:05.678 local time
+    second = int(time.mktime((2024, 1, 2, 3, 4, 5, 0, 0, -1)))
+    monkeypatch.setattr(time, "time_ns", lambda: second * 1_000_000_000 + 678_900_000)
+    assert manager.generate_filename("motion", "jpg") == "motion_20240102_030405_678.jpg"
+    # The cached second prefix is reused for the next call.
+    assert manager._second_stamp == (second, "20240102_030405")
+    # Repeating the same name within the millisecond adds a sequence suffix;
+    # a different prefix does not collide.
+    assert manager.generate_filename("clip", "avi") == "clip_20240102_030405_678.avi"
+    assert manager.generate_filename("motion", "jpg") == "motion_20240102_030405_678_001.jpg"
+    assert manager.generate_filename("motion", "jpg") == "motion_20240102_030405_678_002.jpg"
+
+
+def test_photo_and_clip_in_same_millisecond_share_a_stem(manager, monkeypatch):
+    monkeypatch.setattr(time, "time_ns", lambda: 1_700_000_000_913_000_000)
+    photo = manager.generate_filename("motion", "jpg")
+    clip = manager.generate_filename("motion", "mp4")
+    assert os.path.splitext(photo)[0] == os.path.splitext(clip)[0]
+
+
 def test_build_encode_params_jpeg(manager):
     params = manager._build_encode_params(".jpg", 80)
     assert params == [cv2.IMWRITE_JPEG_QUALITY, 80]
@@ -64,3 +88,42 @@ def test_cleanup_old_files_respects_max_count(manager, sample_image):
 
     stats = manager.get_file_statistics()
     assert stats["total_files"] == 2
+
+
+def test_cleanup_and_statistics_use_modification_times(manager, sample_image):
+    now = time.time()
+    for i, age_days in enumerate([0, 1, 40]):
+        path, _ = manager.save_image(sample_image, f"img_{i}.jpg", quality=90)
+        os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+    (manager.base_directory / "notes.txt").write_text("not an image")
+
+    stats = manager.get_file_statistics()
+    assert stats["total_files"] == 3
+    assert stats["oldest_file"]["name"] == "img_2.jpg"
+    assert stats["newest_file"]["name"] == "img_0.jpg"
+
+    assert manager.cleanup_old_files(max_files=10, max_age_days=30) == 1
+    assert manager.get_file_statistics()["oldest_file"]["name"] == "img_1.jpg"
+
+
+def test_save_image_uses_turbojpeg_encoder_when_available(manager, sample_image):
+    class FakeTurboJPEG:
+        def __init__(self):
+            self.qualities = []
+
+        def encode(self, image, quality):
+            self.qualities.append(quality)
+            return cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
+
+    manager._jpeg = FakeTurboJPEG()
+    path, size = manager.save_image(sample_image, "turbo.jpg", quality=80)
+    manager.save_image(sample_image, "default.jpg")
+
+    assert manager._jpeg.qualities == [80, 95]
+    assert os.path.getsize(path) == size
+    assert cv2.imread(path).shape == sample_image.shape
+
+    # Other formats still go through cv2.imwrite.
+    path, _ = manager.save_image(sample_image, "lossless.png")
+    assert manager._jpeg.qualities == [80, 95]
+    assert os.path.exists(path)
@@ -36,3 +36,16 @@ def test_performance_logger_tracks_and_resets_metrics():
     assert perf.get_metrics_summary()["fps"] == 24.0
     perf.reset_metrics()
     assert perf.get_metrics_summary() == {}
+
+
+def test_performance_logger_formats_debug_messages_lazily(caplog):
+    perf = PerformanceLogger(logging.getLogger("perf-lazy-test"))
+    with caplog.at_level(logging.DEBUG, logger="perf-lazy-test"):
+        perf.log_processing_time("detect", 12.5)
+        perf.log_detection_stats(3, True)
+
+    assert caplog.records[0].args == ("detect", 12.5)
+    assert caplog.messages == [
+        "detect processing time: 12.50ms",
+        "Detection stats - Contours: 3, Motion: True",
+    ]
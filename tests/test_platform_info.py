@@ -0,0 +1,37 @@
+"""Tests for the host platform facts."""
+
+import importlib
+import platform
+import sys
+
+import pytest
+
+from motion_detector.utils import platform_info
+
+
+def test_is_arm_covers_32_and_64_bit_pi():
+    assert platform_info.is_arm_machine("armv7l") is True
+    assert platform_info.is_arm_machine("aarch64") is True
+    assert platform_info.is_arm_machine("x86_64") is False
+
+
+@pytest.mark.parametrize("machine, expected", [("aarch64", True), ("x86_64", False)])
+def test_detector_and_validators_follow_platform_info(monkeypatch, machine, expected):
+    # Import fresh copies against a faked machine; monkeypatch puts the
+    # originals back in sys.modules and on their packages afterwards.
+    monkeypatch.setattr(platform, "machine", lambda: machine)
+    names = [
+        "motion_detector.utils.platform_info",
+        "motion_detector.utils.validators",
+        "motion_detector.core.detector",
+    ]
+    for name in names:
+        package, _, attr = name.rpartition(".")
+        monkeypatch.delitem(sys.modules, name)
+        monkeypatch.setattr(sys.modules[package], attr, sys.modules[package].__dict__[attr])
+
+    fresh_detector = importlib.import_module("motion_detector.core.detector")
+    fresh_validators = importlib.import_module("motion_detector.utils.validators")
+
+    assert fresh_detector.IS_ARM is expected
+    assert fresh_validators._IS_ARM is expected
@@ -1,5 +1,6 @@
 """Tests for the ImageProcessor motion-detection pipeline."""
 
+import cv2
 import numpy as np
 import pytest
 
@@ -43,6 +44,16 @@ def test_static_scene_reports_no_motion(processor):
     assert contours == []
 
 
+def test_static_scene_skips_morphology_and_contours(processor, monkeypatch):
+    bg = _background()
+    processor.initialize_background(bg)
+    monkeypatch.setattr(processor, "_clean_mask", lambda mask: pytest.fail("mask was cleaned"))
+    detected, contours, mask = processor.detect_motion(bg)
+    assert detected is False
+    assert contours == []
+    assert not mask.any()
+
+
 def test_large_change_triggers_motion(processor):
     processor.initialize_background(_background())
     detected, contours, _ = processor.detect_motion(_frame_with_motion())
@@ -50,6 +61,24 @@ def test_large_change_triggers_motion(processor):
     assert len(contours) >= 1
 
 
+def test_detect_motion_accepts_umat(processor):
+    processor.initialize_background(cv2.UMat(_background()))
+    detected, contours, diff_image = processor.detect_motion(cv2.UMat(_frame_with_motion()))
+    assert detected is True
+    assert len(contours) >= 1
+    assert isinstance(diff_image, np.ndarray)
+
+
+def test_last_motion_area_matches_contour_areas(processor):
+    processor.initialize_background(_background())
+    _, contours, _ = processor.detect_motion(_frame_with_motion())
+    expected = sum(cv2.contourArea(c) for c in contours)
+    assert processor.last_motion_area == pytest.approx(expected)
+
+    processor.detect_motion(_background())
+    assert processor.last_motion_area == 0.0
+
+
 def test_small_change_below_min_area_is_ignored(processor):
     processor.initialize_background(_background())
     frame = _background()
@@ -67,6 +96,7 @@ def test_statistics_track_frames_and_events(processor):
     stats = processor.get_processing_statistics()
     assert stats["frames_processed"] == 2
     assert stats["motion_detected_count"] == 1
+    assert stats["average_processing_time"] == pytest.approx(stats["total_processing_time"] / 2)
 
     processor.reset_statistics()
     assert processor.get_processing_statistics()["frames_processed"] == 0
@@ -80,12 +110,41 @@ def test_update_background_moves_toward_new_frame(processor):
     assert processor.background_frame.mean() > before
 
 
+def test_update_background_reuses_detect_preprocessing(processor, monkeypatch):
+    processor.initialize_background(_background())
+    calls = []
+    original = processor.preprocess_frame
+    monkeypatch.setattr(processor, "preprocess_frame", lambda f: calls.append(f) or original(f))
+
+    frame = _frame_with_motion()
+    processor.detect_motion(frame)
+    processor.update_background(frame)
+    assert len(calls) == 1
+
+    # Any other frame, or the same one a second time, is preprocessed again.
+    processor.update_background(frame)
+    processor.update_background(_background())
+    assert len(calls) == 3
+
+
+def test_update_background_accumulates_small_changes(processor):
+    # 0.05 of a one-level step rounds away in uint8 arithmetic every time;
+    # the float32 average still converges.
+    processor.initialize_background(np.full((240, 320, 3), 100, dtype=np.uint8))
+    for _ in range(30):
+        processor.update_background(np.full((240, 320, 3), 101, dtype=np.uint8))
+    assert processor.background_frame.dtype == np.uint8
+    assert processor.background_frame.min() == 101
+
+
 def test_optimize_for_raspberry_pi_reduces_cost(processor):
     processor.config.blur_kernel_size = 21
     processor.config.dilate_iterations = 2
     processor.optimize_for_raspberry_pi()
     assert processor.config.blur_kernel_size <= 15
+    assert processor._blur_ksize == (processor.config.blur_kernel_size,) * 2
     assert processor.config.dilate_iterations == 1
+    assert processor.config.background_update_interval == 3
 
 
 def _subtractor_processor(algorithm):
@@ -108,6 +167,20 @@ def test_subtractor_detects_motion(algorithm):
     assert len(contours) >= 1
 
 
+@pytest.mark.parametrize("algorithm", ["mog2", "knn"])
+def test_subtractor_without_shadows_yields_binary_mask(algorithm):
+    config = create_default_config()["detection"]
+    config.algorithm = algorithm
+    config.detect_shadows = False
+    processor = ImageProcessor(config)
+
+    for _ in range(15):
+        processor.detect_motion(_background())
+    foreground = processor._subtractor_mask(processor.preprocess_frame(_frame_with_motion()))
+    assert set(np.unique(foreground)) <= {0, 255}
+    assert foreground.any()
+
+
 @pytest.mark.parametrize("algorithm", ["mog2", "knn"])
 def test_subtractor_ignores_update_background(algorithm):
     processor = _subtractor_processor(algorithm)
@@ -157,3 +230,95 @@ def test_draw_contours_and_overlay_preserve_shape(processor):
     _, contours, _ = processor.detect_motion(frame)
     assert processor.draw_contours(frame, contours).shape == frame.shape
     assert processor.add_overlay_info(frame, True, 24.0).shape == frame.shape
+
+
+def test_draw_contours_outlines_match_draw_contours(processor):
+    processor.initialize_background(_background())
+    frame = _frame_with_motion()
+    _, contours, _ = processor.detect_motion(frame)
+
+    drawn = processor.draw_contours(frame, contours)
+    expected = frame.copy()
+    cv2.drawContours(expected, contours, -1, (0, 0, 255), 2)
+    outline = np.all(expected == (0, 0, 255), axis=2)
+    assert outline.any()
+    assert np.all(drawn[outline] == (0, 0, 255))
+    assert processor.draw_contours(frame, []) is not frame
+
+
+def test_overlays_can_draw_in_place(processor):
+    processor.initialize_background(_background())
+    frame = _frame_with_motion()
+    _, contours, _ = processor.detect_motion(frame)
+    original = frame.copy()
+
+    assert processor.draw_contours(frame, contours, inplace=True) is frame
+    assert processor.add_overlay_info(frame, True, 24.0, inplace=True) is frame
+    assert not np.array_equal(frame, original)
+
+
+def test_downscaled_detection_reports_full_resolution_results(processor):
+    full = _frame_with_motion()
+    processor.initialize_background(_background())
+    _, full_contours, _ = processor.detect_motion(full)
+    full_area = processor.last_motion_area
+
+    half = ImageProcessor(create_default_config()["detection"])
+    half.initialize_background(cv2.resize(_background(), (160, 120)))
+    detected, contours, _ = half.detect_motion(cv2.resize(full, (160, 120)), scale=0.5)
+
+    assert detected is True
+    # Blur and dilation act in pixels, so the low-res blob grows a little more.
+    assert half.last_motion_area == pytest.approx(full_area, rel=0.25)
+    # Contours come back in full-resolution coordinates.
+    x, y, w, h = cv2.boundingRect(contours[0])
+    assert x + w > 160 and y + h > 120
+
+
+def test_roi_regions_scale_with_detection(processor):
+    processor.config.regions = [[100, 40, 100, 80]]
+    mask = processor._get_roi_mask((120, 160), scale=0.5)
+    assert mask[20:60, 50:100].all()
+    assert not mask[:20].any()
+
+
+@pytest.mark.parametrize("dilate_iterations", [0, 1, 2])
+def test_clean_mask_matches_close_open_dilate(processor, dilate_iterations):
+    rng = np.random.default_rng(0)
+    mask = np.where(rng.random((60, 80)) > 0.7, 255, 0).astype(np.uint8)
+    processor.config.dilate_iterations = dilate_iterations
+
+    kernel = np.ones((3, 3), np.uint8)
+    expected = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+    expected = cv2.morphologyEx(expected, cv2.MORPH_OPEN, kernel)
+    expected = cv2.dilate(expected, kernel, iterations=dilate_iterations)
+
+    np.testing.assert_array_equal(processor._clean_mask(mask.copy()), expected)
+
+
+def test_working_buffers_are_reused_between_frames(processor):
+    processor.initialize_background(_background())
+    _, _, first = processor.detect_motion(_frame_with_motion())
+    _, _, second = processor.detect_motion(_background())
+    assert second is first is processor._delta
+
+    # A new frame size reallocates; the background keeps its own storage.
+    processor.initialize_background(_background(160, 120))
+    assert processor._delta.shape == (120, 160)
+    assert not np.shares_memory(processor.background_frame, processor._gray)
+
+
+@pytest.mark.parametrize("method", ["stack", "box"])
+def test_blur_methods_approximate_gaussian(method):
+    config = create_default_config()["detection"]
+    gaussian = ImageProcessor(config)
+    config.blur_method = method
+    fast = ImageProcessor(config)
+
+    frame = _frame_with_motion()
+    expected = gaussian.preprocess_frame(frame).astype(int)
+    actual = fast.preprocess_frame(frame).astype(int)
+    assert np.abs(actual - expected).mean() < 3
+
+    fast.initialize_background(_background())
+    assert fast.detect_motion(frame)[0] is True
@@ -1,6 +1,11 @@
 """Tests for configuration validation helpers."""
 
+from types import SimpleNamespace
+
+import cv2
+
 from motion_detector.config.settings import Settings
+from motion_detector.utils import validators
 from motion_detector.utils.validators import validate_config
 
 
@@ -36,3 +41,416 @@ def test_validate_config_flags_bad_photo_quality(tmp_path):
     ok, errors = validate_config(settings)
     assert ok is False
     assert any("Photo quality" in e for e in errors)
+
+
+def test_run_system_diagnostics_reuses_cached_camera_probe(monkeypatch):
+    calls = []
+
+    def fake_probe(device_index=0, **kwargs):
+        calls.append(device_index)
+        return True, "fake camera"
+
+    monkeypatch.setattr(validators, "validate_camera_access", fake_probe)
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+
+    first = validators.run_system_diagnostics()
+    second = validators.run_system_diagnostics(cached_camera_probe=True)
+    validators.run_system_diagnostics()
+
+    # The cached call skips the probe; an uncached call probes again.
+    assert len(calls) == 2
+    assert first.camera_message == second.camera_message == "fake camera"
+
+
+def test_system_samples_are_reused_within_ttl(monkeypatch):
+    calls = []
+
+    def fake_virtual_memory():
+        calls.append(1)
+        return SimpleNamespace(total=4 * 1024**3, available=2 * 1024**3)
+
+    monkeypatch.setattr(validators.psutil, "virtual_memory", fake_virtual_memory)
+    monkeypatch.setattr(validators, "_samples", {})
+
+    validators.validate_performance_requirements((1280, 720), 10)
+    validators.validate_performance_requirements((1280, 720), 10)
+    assert len(calls) == 1
+
+    # Once the sample is older than the TTL it is taken again.
+    validators._samples["virtual_memory"] = (-validators.SAMPLE_TTL, None)
+    validators.validate_performance_requirements((1280, 720), 10)
+    assert len(calls) == 2
+
+
+def test_cpu_usage_check_does_not_block(monkeypatch):
+    intervals = []
+
+    def fake_cpu_percent(interval=None):
+        intervals.append(interval)
+        return 95.0
+
+    monkeypatch.setattr(validators.psutil, "cpu_percent", fake_cpu_percent)
+    monkeypatch.setattr(validators, "_samples", {})
+
+    _, warnings = validators.validate_system_requirements()
+    assert intervals == [None]
+    assert any("High CPU usage" in w for w in warnings)
+
+
+def test_disabled_checks_skip_psutil(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("psutil should not be sampled")
+
+    monkeypatch.setattr(validators.psutil, "cpu_percent", fail)
+    monkeypatch.setattr(validators.psutil, "virtual_memory", fail)
+    monkeypatch.setattr(validators.shutil, "disk_usage", fail)
+    monkeypatch.setattr(validators, "_samples", {})
+
+    ok, warnings = validators.validate_system_requirements(
+        check_cpu=False, check_memory=False, check_disk=False, check_platform=False
+    )
+    assert ok is True
+    assert warnings == []
+
+
+def test_validate_config_cache_tracks_field_changes(tmp_path):
+    settings = make_settings(tmp_path)
+    assert validate_config(settings) == (True, [])
+    hits = validators._check_config_fields.cache_info().hits
+    assert validate_config(settings) == (True, [])
+    assert validators._check_config_fields.cache_info().hits == hits + 1
+
+    settings.storage.max_photos = 0
+    ok, errors = validate_config(settings)
+    assert ok is False
+    assert any("Maximum photos" in e for e in errors)
+
+
+def test_arm_recommendations_cover_aarch64(monkeypatch):
+    monkeypatch.setattr(validators, "_IS_ARM", True)
+    _, recommendations = validators.validate_performance_requirements((1280, 720), 30)
+    assert any("ARM processor" in r for r in recommendations)
+
+    monkeypatch.setattr(validators, "_IS_ARM", False)
+    _, recommendations = validators.validate_performance_requirements((1280, 720), 30)
+    assert not any("ARM processor" in r for r in recommendations)
+
+
+def test_raspberry_pi_probe_reads_bounded_head(monkeypatch):
+    sizes = []
+
+    class FakeFile:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def read(self, size=-1):
+            sizes.append(size)
+            return b"Raspberry Pi 4 Model B Rev 1.4\x00"
+
+    monkeypatch.setattr(validators, "_SYSTEM", "Linux")
+    monkeypatch.setattr(validators, "open", lambda path, mode="r": FakeFile(), raising=False)
+    assert validators._detect_raspberry_pi() is True
+    assert sizes == [4096]
+
+
+def test_camera_access_uses_v4l2_probe_without_opening_capture(monkeypatch):
+    def no_capture(*args, **kwargs):
+        raise AssertionError("OpenCV capture should not be opened")
+
+    monkeypatch.setattr(cv2, "VideoCapture", no_capture)
+    monkeypatch.setattr(validators, "_probe_v4l2", lambda index: ("unicam", "unicam", 0x1))
+    ok, message = validators.validate_camera_access(0, backend="opencv")
+    assert ok is True
+    assert "unicam" in message
+
+    monkeypatch.setattr(validators, "_probe_v4l2", lambda index: ("m2m", "codec", 0x4000))
+    ok, message = validators.validate_camera_access(0, backend="opencv")
+    assert ok is False
+    assert "video capture" in message
+
+
+def test_camera_access_deep_probe_opens_capture(monkeypatch):
+    opened = []
+
+    def fake_capture(index):
+        opened.append(index)
+        return SimpleNamespace(isOpened=lambda: False, release=lambda: None)
+
+    monkeypatch.setattr(cv2, "VideoCapture", fake_capture)
+    monkeypatch.setattr(validators, "_probe_v4l2", lambda index: ("uvcvideo", "cam", 0x1))
+    ok, _ = validators.validate_camera_access(2, deep_probe=True, backend="opencv")
+    assert ok is False
+    assert opened == [2]
+
+
+def test_network_check_leaves_default_timeout_alone():
+    import socket
+
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        ok, _ = validators.validate_network_connectivity("127.0.0.1", port, timeout=1)
+
+    assert ok is True
+    assert socket.getdefaulttimeout() is None
+
+
+def test_directory_permissions_skip_write_probe(tmp_path, monkeypatch):
+    monkeypatch.setattr(validators, "_access_is_reliable", lambda: True)
+    target = tmp_path / "photos"
+
+    ok, message = validators.validate_directory_permissions(str(target))
+    assert ok is True
+    assert "writable" in message
+    assert list(target.iterdir()) == []
+
+
+def test_directory_permissions_reports_missing_access(tmp_path, monkeypatch):
+    monkeypatch.setattr(validators.os, "access", lambda path, mode: False)
+    ok, message = validators.validate_directory_permissions(str(tmp_path))
+    assert ok is False
+    assert "No write permission" in message
+
+
+def test_validate_config_log_level_is_case_insensitive(tmp_path):
+    settings = make_settings(tmp_path)
+    settings.logging.level = "debug"
+    assert validate_config(settings) == (True, [])
+
+    settings.logging.level = "VERBOSE"
+    ok, errors = validate_config(settings)
+    assert ok is False
+    assert any("Log level" in e for e in errors)
+
+
+def test_performance_requirements_small_stream_skips_system_samples(monkeypatch):
+    def fail():
+        raise AssertionError("system specs should not be sampled")
+
+    monkeypatch.setattr(validators, "_cpu_count", fail)
+    monkeypatch.setattr(validators, "_virtual_memory", fail)
+    monkeypatch.setattr(validators, "_IS_ARM", True)
+    assert validators.validate_performance_requirements((320, 240), 10) == (True, [])
+
+
+def test_run_system_diagnostics_times_out_stuck_camera_probe(monkeypatch):
+    import threading
+
+    release = threading.Event()
+    probe_threads = []
+
+    def stuck_probe(**kwargs):
+        probe_threads.append(threading.current_thread())
+        release.wait(5)
+        return True, "late camera"
+
+    monkeypatch.setattr(validators, "validate_camera_access", stuck_probe)
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+    try:
+        results = validators.run_system_diagnostics(camera_timeout=0.05)
+    finally:
+        release.set()
+
+    assert results.camera_accessible is False
+    assert "timed out after 0.05s" in results.camera_message
+    # A daemon thread cannot hold up interpreter exit.
+    assert probe_threads and probe_threads[0].daemon
+    assert validators._camera_probe_result is None
+
+
+def test_run_system_diagnostics_single_threaded(monkeypatch):
+    import threading
+
+    threads = []
+
+    def probe(**kwargs):
+        threads.append(threading.current_thread())
+        return True, "fake camera"
+
+    monkeypatch.setattr(validators, "validate_camera_access", probe)
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+    results = validators.run_system_diagnostics(parallel=False)
+    assert results.camera_accessible is True
+    assert threads == [threading.main_thread()]
+
+
+def test_validate_config_fail_fast_reports_first_error(tmp_path):
+    settings = make_settings(tmp_path)
+    settings.camera.framerate = 0
+    settings.storage.max_photos = 0
+
+    _, all_errors = validate_config(settings)
+    ok, errors = validate_config(settings, fail_fast=True)
+    assert len(all_errors) == 2
+    assert ok is False
+    assert errors == all_errors[:1]
+
+
+def test_directory_permissions_cache_successes_only(tmp_path, monkeypatch):
+    calls = []
+    real_access = validators.os.access
+
+    def counting_access(path, mode):
+        calls.append(path)
+        return real_access(path, mode)
+
+    monkeypatch.setattr(validators, "_DIR_CACHE", {})
+    monkeypatch.setattr(validators, "_access_is_reliable", lambda: True)
+    monkeypatch.setattr(validators.os, "access", counting_access)
+    target = str(tmp_path)
+
+    assert validators.validate_directory_permissions(target)[0] is True
+    (tmp_path / "photo.jpg").write_bytes(b"x")  # new files do not invalidate
+    assert validators.validate_directory_permissions(target)[0] is True
+    assert len(calls) == 1
+
+    monkeypatch.setattr(validators.os, "access", lambda path, mode: False)
+    validators._DIR_CACHE.clear()
+    assert validators.validate_directory_permissions(target)[0] is False
+    assert target not in validators._DIR_CACHE
+
+
+def test_directory_permissions_probes_missing_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(validators, "_DIR_CACHE", {})
+    target = tmp_path / "new"
+    assert validators.validate_directory_permissions(str(target))[0] is True
+    assert target.is_dir()
+
+
+def test_version_tuple_compares_numerically():
+    assert validators._version_tuple("10.0.0") > (4, 0, 0)
+    assert validators._version_tuple("3.4.18") < (4, 0, 0)
+    assert validators._version_tuple("4.8.0-dev") == (4, 8, 0)
+
+
+def test_validate_all_samples_memory_once(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_virtual_memory():
+        calls.append(1)
+        return SimpleNamespace(total=4 * 1024**3, available=2 * 1024**3)
+
+    monkeypatch.setattr(validators.psutil, "virtual_memory", fake_virtual_memory)
+    monkeypatch.setattr(validators, "_samples", {})
+    monkeypatch.setattr(
+        validators, "validate_camera_access", lambda **kwargs: (True, "fake camera")
+    )
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+
+    settings = make_settings(tmp_path)
+    settings.camera.resolution = [1280, 720]
+    results = validators.validate_all(settings)
+
+    assert len(calls) == 1
+    assert results["config_valid"] is True
+    assert results["config_errors"] == []
+    assert "system_ready" in results
+    assert "recommendations" in results
+
+
+def test_run_system_diagnostics_logs_one_record(monkeypatch, caplog):
+    import logging
+
+    monkeypatch.setattr(
+        validators, "validate_camera_access", lambda **kwargs: (True, "fake camera")
+    )
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+    logger = logging.getLogger("test_diagnostics")
+
+    with caplog.at_level(logging.INFO, logger="test_diagnostics"):
+        validators.run_system_diagnostics(logger)
+
+    records = [r for r in caplog.records if r.name == "test_diagnostics"]
+    assert len(records) == 1
+    assert "fake camera" in records[0].getMessage()
+    assert "Memory:" in records[0].getMessage()
+
+
+def test_camera_deep_probe_grabs_without_decoding(monkeypatch):
+    class FakeCapture:
+        released = False
+
+        def isOpened(self):
+            return True
+
+        def grab(self):
+            return True
+
+        def read(self):
+            raise AssertionError("deep probe should not decode a frame")
+
+        def get(self, prop):
+            return {cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480}.get(prop, 30.0)
+
+        def release(self):
+            FakeCapture.released = True
+
+    monkeypatch.setattr(cv2, "VideoCapture", lambda index: FakeCapture())
+    ok, message = validators.validate_camera_access(0, deep_probe=True, backend="opencv")
+    assert ok is True
+    assert "640x480" in message
+    assert FakeCapture.released is True
+
+
+def test_camera_access_skips_v4l2_for_picamera2(monkeypatch):
+    def no_v4l2(index):
+        raise AssertionError("V4L2 QUERYCAP does not reflect the picamera2 camera")
+
+    monkeypatch.setattr(validators, "_probe_v4l2", no_v4l2)
+    monkeypatch.setattr(validators, "_probe_picamera2", lambda: (True, "imx708 (picamera2)"))
+    assert validators.validate_camera_access(0, backend="picamera2") == (
+        True,
+        "imx708 (picamera2)",
+    )
+
+
+def test_diagnostics_and_requirements_share_thresholds(monkeypatch):
+    memory = SimpleNamespace(total=4 * 1024**3, available=validators._MIN_AVAIL_BYTES)
+    disk = SimpleNamespace(free=validators._MIN_FREE_DISK_BYTES)
+    monkeypatch.setattr(validators, "_virtual_memory", lambda: memory)
+    monkeypatch.setattr(validators, "_root_disk_usage", lambda: disk)
+    monkeypatch.setattr(validators, "validate_camera_access", lambda **kwargs: (True, "cam"))
+    monkeypatch.setattr(validators, "_camera_probe_result", None)
+
+    results = validators.run_system_diagnostics(parallel=False)
+    _, warnings = validators.validate_system_requirements(check_cpu=False, check_platform=False)
+    assert results.memory_ok and results.disk_space_ok
+    assert not any("Low" in w for w in warnings)
+
+
+def test_camera_access_missing_node_skips_opencv(monkeypatch):
+    def no_capture(*args, **kwargs):
+        raise AssertionError("OpenCV capture should not be opened")
+
+    def missing(path, flags):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(cv2, "VideoCapture", no_capture)
+    monkeypatch.setattr(validators, "_SYSTEM", "Linux")
+    monkeypatch.setattr(validators.os, "open", missing)
+    assert validators.validate_camera_access(7, backend="opencv") == (
+        False,
+        "Camera device 7 not accessible",
+    )
+
+
+def test_camera_access_unqueryable_node_falls_back_to_opencv(monkeypatch):
+    opened = []
+
+    def fake_capture(index):
+        opened.append(index)
+        return SimpleNamespace(isOpened=lambda: False, release=lambda: None)
+
+    def denied(path, flags):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(cv2, "VideoCapture", fake_capture)
+    monkeypatch.setattr(validators, "_SYSTEM", "Linux")
+    monkeypatch.setattr(validators.os, "open", denied)
+    ok, _ = validators.validate_camera_access(3, backend="opencv")
+    assert ok is False
+    assert opened == [3]